@@ -0,0 +1,83 @@
+import os
+
+import pytest
+
+from pages import page_metrics, result_store, retry
+from pages.flake_history import DEFAULT_PATH, FlakeHistory
+
+try:
+    from pytest_html import extras as html_extras
+except ImportError:
+    html_extras = None
+
+
+def pytest_addoption(parser):
+    # Без этих опций pytest ничего не пишет в рабочий каталог
+    parser.addoption("--flake-history",
+                     help=f"база истории прогонов (нестабильные и медленные тесты), например {DEFAULT_PATH}")
+    parser.addoption("--no-history-order", action="store_true",
+                     help="не переупорядочивать тесты по истории прогонов")
+    parser.addoption("--result-store",
+                     help="SQLite-хранилище результатов (отчёт: python -m pages.result_report); "
+                          f"при заданном UI_RUN_ID по умолчанию {result_store.DEFAULT_PATH}")
+
+
+history = None
+results = None
+
+
+def pytest_configure(config):
+    global history, results
+    history_path = config.getoption("--flake-history")
+    if history_path:
+        history = FlakeHistory(history_path)
+    # Воркеры планировщика пишут результаты под общим идентификатором прогона
+    results_path = config.getoption("--result-store")
+    if results_path is None and os.environ.get("UI_RUN_ID"):
+        results_path = result_store.DEFAULT_PATH
+    if results_path:
+        results = result_store.ResultStore(results_path, os.environ.get("UI_RUN_ID"))
+
+
+def pytest_unconfigure(config):
+    if history is not None:
+        history.close()
+    if results is not None:
+        results.close()
+
+
+def pytest_collection_modifyitems(config, items):
+    # Нестабильные и медленные тесты - первыми, чтобы не растягивать хвост прогона
+    if history is None or config.getoption("--no-history-order"):
+        return
+    position = {nodeid: i for i, nodeid in enumerate(history.order([item.nodeid for item in items]))}
+    items.sort(key=lambda item: position[item.nodeid])
+
+
+def pytest_runtest_logreport(report):
+    # Результат теста - фаза call, либо упавший/пропущенный setup
+    if report.when == "call" or (report.when == "setup" and not report.passed):
+        retries = sum(retry.stats.pop(report.nodeid, {}).values())
+        if history is not None:
+            history.record(report.nodeid, report.outcome, report.duration, retries)
+    # В хранилище - все фазы, результат пишется сразу, а не копится до конца сессии
+    if results is not None:
+        results.add(report)
+
+
+@pytest.hookimpl(hookwrapper=True)
+def pytest_runtest_makereport(item, call):
+    outcome = yield
+    report = outcome.get_result()
+    if report.when != "call":
+        return
+    # Замеры теста сворачиваются в сводку и не копятся до конца сессии;
+    # сводка уходит в хранилище результатов (и в pytest-html, если он включён)
+    samples = page_metrics.scenarios.pop(item.nodeid, None)
+    if not samples:
+        return
+    report.page_metrics = page_metrics.summarize(samples)
+    if html_extras is not None:
+        report.extras = getattr(report, "extras", []) + [
+            html_extras.json(report.page_metrics, name="Метрики страницы"),
+        ]
@@ -1,22 +1,79 @@
+import os
+
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 
+from .retry import RetryPolicy
+
+# Стратегии ввода текста:
+#   type - clear() + send_keys(), по событию на каждую клавишу (как пользователь)
+#   fast - значение ставится одним скриптом, затем события input и change
+FILL_STRATEGIES = ("type", "fast")
+
+# Нативный сеттер value: обработчики страницы видят значение так же, как после ввода
+FAST_FILL_SCRIPT = """
+const element = arguments[0];
+const proto = element instanceof HTMLTextAreaElement ? HTMLTextAreaElement.prototype : HTMLInputElement.prototype;
+Object.getOwnPropertyDescriptor(proto, 'value').set.call(element, arguments[1]);
+element.dispatchEvent(new Event('input', {bubbles: true}));
+element.dispatchEvent(new Event('change', {bubbles: true}));
+"""
+
 class BasePage:
-    def __init__(self, driver):
+    # Реестр локаторов страницы (LocatorRegistry): неизвестный локатор падает сразу, без ожидания
+    locators = None
+    
+    def __init__(self, driver, retry=None, fill_strategy=None):
         self.driver = driver
         self.wait = WebDriverWait(driver, 10)
+        self.retry = retry or RetryPolicy()
+        self.fill_strategy = fill_strategy or os.environ.get('UI_FILL_STRATEGY', 'type')
+        if self.fill_strategy not in FILL_STRATEGIES:
+            raise ValueError(f"Неизвестная стратегия ввода: {self.fill_strategy}")
+    
+    def check_locator(self, by, value):
+        if self.locators is None:
+            return
+        # Первый поиск на загруженной странице реестра сверяет все ID-локаторы с DOM драйвера
+        if not self.locators.live_checked(self.driver):
+            self.locators.validate_live(self.driver)
+        self.locators.check(by, value, self.driver)
     
     def find_element(self, by, value):
+        self.check_locator(by, value)
         return self.wait.until(EC.presence_of_element_located((by, value)))
     
     def find_clickable_element(self, by, value):
+        self.check_locator(by, value)
         return self.wait.until(EC.element_to_be_clickable((by, value)))
     
+    def js_click(self, element):
+        self.driver.execute_script("arguments[0].click();", element)
+    
     def click(self, by, value):
-        element = self.find_clickable_element(by, value)
-        element.click()
+        # Элемент ищется заново на каждой попытке: после stale старая ссылка бесполезна
+        def action():
+            self.find_clickable_element(by, value).click()
+        
+        def fallback(kind):
+            element = self.find_clickable_element(by, value)
+            if kind == "intercepted":
+                self.js_click(element)
+            else:
+                element.click()
+        
+        self.retry.run(action, fallback)
+    
+    def fill(self, element, text):
+        """Вводит text в поле согласно self.fill_strategy"""
+        if self.fill_strategy == "fast":
+            self.driver.execute_script(FAST_FILL_SCRIPT, element, text)
+        else:
+            element.clear()
+            element.send_keys(text)
     
     def send_keys(self, by, value, text):
-        element = self.find_element(by, value)
-        element.clear()
-        element.send_keys(text)
\ No newline at end of file
+        def action():
+            self.fill(self.find_element(by, value), text)
+        
+        self.retry.run(action)
@@ -0,0 +1,193 @@
+"""Запись потока команд WebDriver в NDJSON-трассу и её офлайн-анализ.
+
+Запись:
+    recorder = record_commands(driver, "trace.ndjson")
+
+Анализ:
+    python -m pages.command_trace trace.ndjson [--gap 0.2]
+"""
+import argparse
+import json
+import os
+import threading
+import time
+from collections import Counter, defaultdict
+
+# Команды поиска элементов (в т.ч. опросы WebDriverWait)
+LOOKUP_COMMANDS = {"findElement", "findElements", "findChildElement", "findChildElements"}
+# После этих команд DOM считается новым и повторный поиск не избыточен
+NAVIGATION_COMMANDS = {"get", "refresh", "goBack", "goForward", "switchToWindow", "newWindow"}
+
+
+def _payload_size(data):
+    """Размер полезной нагрузки в байтах (как она уходит по протоколу)"""
+    if data is None:
+        return 0
+    try:
+        return len(json.dumps(data, ensure_ascii=False, default=str).encode("utf-8"))
+    except (TypeError, ValueError):
+        return 0
+
+
+def current_test_name():
+    """Имя текущего теста pytest (или пустая строка вне pytest)"""
+    return os.environ.get("PYTEST_CURRENT_TEST", "").rsplit(" ", 1)[0]
+
+
+class CommandRecorder:
+    """Обёртка над driver.execute: каждая команда пишется строкой NDJSON"""
+
+    def __init__(self, driver, path):
+        self.driver = driver
+        self.path = path
+        self._lock = threading.Lock()
+        self._file = open(path, "a", encoding="utf-8")
+        self._execute = driver.execute
+        driver.execute = self._traced_execute
+
+    def _traced_execute(self, driver_command, params=None):
+        started = time.time()
+        response = None
+        error = None
+        try:
+            response = self._execute(driver_command, params)
+            return response
+        except Exception as e:
+            error = type(e).__name__
+            raise
+        finally:
+            finished = time.time()
+            record = {
+                "ts": round(started, 6),
+                "dur": round(finished - started, 6),
+                "cmd": driver_command,
+                "req": _payload_size(params),
+                "resp": _payload_size(response.get("value") if isinstance(response, dict) else None),
+                "test": current_test_name(),
+            }
+            if params and driver_command in LOOKUP_COMMANDS:
+                record["using"] = params.get("using")
+                record["value"] = params.get("value")
+            if error:
+                record["err"] = error
+            self._write(record)
+            if driver_command == "quit":
+                self.stop()
+
+    def _write(self, record):
+        with self._lock:
+            if self._file.closed:
+                return
+            self._file.write(json.dumps(record, ensure_ascii=False) + "\n")
+            self._file.flush()
+
+    def stop(self):
+        """Снимает обёртку и закрывает файл трассы"""
+        with self._lock:
+            if self.driver.execute == self._traced_execute:
+                self.driver.execute = self._execute
+            if not self._file.closed:
+                self._file.close()
+
+
+def record_commands(driver, path):
+    """Включает запись команд драйвера в файл path"""
+    return CommandRecorder(driver, path)
+
+
+def load_trace(path):
+    """Читает трассу построчно"""
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if line:
+                yield json.loads(line)
+
+
+def analyze_trace(records, gap_threshold=0.2):
+    """Сводка по каждому тесту: избыточные поиски, простои, время по типам команд"""
+    by_test = defaultdict(list)
+    for record in records:
+        by_test[record.get("test") or "<вне теста>"].append(record)
+
+    report = {}
+    for test, commands in by_test.items():
+        commands.sort(key=lambda r: r["ts"])
+        seen = set()
+        redundant = Counter()
+        failed_polls = Counter()
+        gaps = []
+        busy_by_cmd = Counter()
+        prev_end = None
+        for record in commands:
+            cmd = record["cmd"]
+            if cmd in NAVIGATION_COMMANDS:
+                seen.clear()
+            if cmd in LOOKUP_COMMANDS:
+                key = (record.get("using"), record.get("value"))
+                if record.get("err"):
+                    failed_polls[key] += 1
+                elif key in seen:
+                    redundant[key] += 1
+                else:
+                    seen.add(key)
+            if prev_end is not None and record["ts"] - prev_end > gap_threshold:
+                gaps.append({"after": prev_cmd, "before": cmd, "sec": round(record["ts"] - prev_end, 3)})
+            busy_by_cmd[cmd] += record["dur"]
+            prev_end = record["ts"] + record["dur"]
+            prev_cmd = cmd
+
+        span = prev_end - commands[0]["ts"]
+        busy = sum(busy_by_cmd.values())
+        report[test] = {
+            "commands": len(commands),
+            "span_sec": round(span, 3),
+            "busy_sec": round(busy, 3),
+            "idle_sec": round(span - busy, 3),
+            "redundant_lookups": redundant.most_common(),
+            "failed_polls": failed_polls.most_common(),
+            "gaps": sorted(gaps, key=lambda g: g["sec"], reverse=True),
+            # Время теста, разложенное по типам команд и простоям
+            "time_by_command": [(cmd, round(sec, 3)) for cmd, sec in busy_by_cmd.most_common()]
+                               + [("<простой>", round(span - busy, 3))],
+        }
+    return report
+
+
+def print_report(report, top=5):
+    for test, stats in sorted(report.items(), key=lambda kv: kv[1]["span_sec"], reverse=True):
+        print("=" * 60)
+        print(test)
+        print("=" * 60)
+        print(f"Команд: {stats['commands']}, длительность: {stats['span_sec']} с "
+              f"(работа {stats['busy_sec']} с, простой {stats['idle_sec']} с)")
+        print("Время по командам:")
+        for cmd, sec in sorted(stats["time_by_command"], key=lambda c: c[1], reverse=True)[:top]:
+            print(f"  {cmd:25} {sec} с")
+        if stats["redundant_lookups"]:
+            print("Повторные поиски:")
+            for (using, value), count in stats["redundant_lookups"][:top]:
+                print(f"  {using}={value}: {count}")
+        if stats["failed_polls"]:
+            print("Неудачные опросы (ожидания):")
+            for (using, value), count in stats["failed_polls"][:top]:
+                print(f"  {using}={value}: {count}")
+        if stats["gaps"]:
+            print("Простои (sleep):")
+            for gap in stats["gaps"][:top]:
+                print(f"  {gap['sec']} с между {gap['after']} и {gap['before']}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Анализ трассы команд WebDriver")
+    parser.add_argument("trace")
+    parser.add_argument("--gap", type=float, default=0.2, help="порог простоя, с")
+    parser.add_argument("--top", type=int, default=5)
+    parser.add_argument("--json", action="store_true", help="вывести сводку в JSON")
+    args = parser.parse_args()
+
+    summary = analyze_trace(load_trace(args.trace), gap_threshold=args.gap)
+    if args.json:
+        print(json.dumps(summary, ensure_ascii=False, indent=2))
+    else:
+        print_report(summary, top=args.top)
@@ -1,40 +1,90 @@
+from .locators import zakaz as ZAKAZ_LOCATORS
 from .base_page import BasePage
-from selenium.webdriver.common.by import By
+from selenium.common.exceptions import NoAlertPresentException, TimeoutException
+from selenium.webdriver.support.ui import WebDriverWait
+from selenium.webdriver.support import expected_conditions as EC
 
 class ContactPage(BasePage):
-    FULL_NAME_INPUT = (By.ID, "full-name")
-    PHONE_INPUT = (By.ID, "phone")
-    ADDRESS_INPUT = (By.ID, "address")
-    AGREEMENT_CHECKBOX = (By.ID, "agreement-checkbox")
-    CHECKOUT_BUTTON = (By.ID, "checkout-btn")
-    
-    def __init__(self, driver):
-        super().__init__(driver)
+    locators = ZAKAZ_LOCATORS
+    
+    # Локаторы (проверены по test_data/zakaz.html, см. pages/locators.py)
+    FULL_NAME_INPUT = ZAKAZ_LOCATORS.locators["FULL_NAME_INPUT"]
+    PHONE_INPUT = ZAKAZ_LOCATORS.locators["PHONE_INPUT"]
+    ADDRESS_INPUT = ZAKAZ_LOCATORS.locators["ADDRESS_INPUT"]
+    AGREEMENT_CHECKBOX = ZAKAZ_LOCATORS.locators["AGREEMENT_CHECKBOX"]
+    CHECKOUT_BUTTON = ZAKAZ_LOCATORS.locators["CHECKOUT_BUTTON"]
+    # Локаторы для ошибок
+    FULL_NAME_ERROR = ZAKAZ_LOCATORS.locators["FULL_NAME_ERROR"]
+    PHONE_ERROR = ZAKAZ_LOCATORS.locators["PHONE_ERROR"]
+    ADDRESS_ERROR = ZAKAZ_LOCATORS.locators["ADDRESS_ERROR"]
+    AGREEMENT_ERROR = ZAKAZ_LOCATORS.locators["AGREEMENT_ERROR"]
+    
+    def __init__(self, driver, retry=None, fill_strategy=None):
+        super().__init__(driver, retry=retry, fill_strategy=fill_strategy)
         self.driver = driver
     
     def fill_full_name(self, name):
         self.send_keys(*self.FULL_NAME_INPUT, name)
     
     def fill_phone_simple(self, phone):
-        phone_field = self.find_element(*self.PHONE_INPUT)
-        phone_field.clear()
-        phone_field.send_keys(phone)
+        self.send_keys(*self.PHONE_INPUT, phone)
     
     def fill_address(self, address):
         self.send_keys(*self.ADDRESS_INPUT, address)
     
     def check_agreement(self):
-        checkbox = self.find_element(*self.AGREEMENT_CHECKBOX)
-        if not checkbox.is_selected():
-            checkbox.click()
+        def action():
+            checkbox = self.find_element(*self.AGREEMENT_CHECKBOX)
+            if not checkbox.is_selected():
+                checkbox.click()
+        
+        def fallback(kind):
+            checkbox = self.find_element(*self.AGREEMENT_CHECKBOX)
+            if not checkbox.is_selected():
+                self.js_click(checkbox)
+        
+        self.retry.run(action, fallback)
     
     def submit_form(self):
         self.click(*self.CHECKOUT_BUTTON)
     
+    def wait_for_alert(self, timeout=5):
+        try:
+            return WebDriverWait(self.driver, timeout).until(EC.alert_is_present())
+        except TimeoutException:
+            raise NoAlertPresentException(f"Alert не появился за {timeout} с")
+    
+    def submit_and_get_alert_text(self, timeout=5):
+        """Отправляет форму и возвращает текст alert (alert закрывается).
+        
+        Если alert не появился, повторяется только клик - через JavaScript.
+        """
+        def action():
+            self.submit_form()
+            return self.wait_for_alert(timeout)
+        
+        def fallback(kind):
+            self.js_click(self.find_element(*self.CHECKOUT_BUTTON))
+            return self.wait_for_alert(timeout)
+        
+        alert = self.retry.run(action, fallback)
+        alert_text = alert.text
+        alert.accept()
+        return alert_text
+    
+    def field_value(self, locator):
+        """Значение поля: для чекбокса - отмечен ли он (тип берётся из разметки страницы)"""
+        by, element_id = locator
+        tag, attrs = self.locators.element(element_id)
+        element = self.find_element(by, element_id)
+        if tag == 'input' and attrs.get('type') == 'checkbox':
+            return element.is_selected()
+        return element.get_attribute('value')
+    
     def get_form_data(self):
         return {
-            'name': self.find_element(*self.FULL_NAME_INPUT).get_attribute('value'),
-            'phone': self.find_element(*self.PHONE_INPUT).get_attribute('value'),
-            'address': self.find_element(*self.ADDRESS_INPUT).get_attribute('value'),
-            'agreement': self.find_element(*self.AGREEMENT_CHECKBOX).is_selected()
+            'name': self.field_value(self.FULL_NAME_INPUT),
+            'phone': self.field_value(self.PHONE_INPUT),
+            'address': self.field_value(self.ADDRESS_INPUT),
+            'agreement': self.field_value(self.AGREEMENT_CHECKBOX)
         }
\ No newline at end of file
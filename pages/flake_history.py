@@ -0,0 +1,79 @@
+"""Локальная история прогонов тестов (SQLite).
+
+По ней тесты упорядочиваются: сначала нестабильные и медленные, чтобы
+они не оказывались «хвостом» прогона.
+"""
+import sqlite3
+import time
+
+DEFAULT_PATH = ".ui_history.sqlite"
+
+# Тест считается нестабильным, если доля прогонов, прошедших только после
+# повторов, и смен результата между прогонами выше порога. Тест, который
+# падает каждый раз, стабилен: нестабильность не в нём, а в коде
+FLAKY_THRESHOLD = 0.1
+
+
+class FlakeHistory:
+    def __init__(self, path=DEFAULT_PATH):
+        self.path = path
+        self.conn = sqlite3.connect(path)
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS runs ("
+            " nodeid TEXT NOT NULL,"
+            " outcome TEXT NOT NULL,"
+            " duration REAL NOT NULL,"
+            " retries INTEGER NOT NULL DEFAULT 0,"
+            " finished_at REAL NOT NULL)"
+        )
+        self.conn.execute("CREATE INDEX IF NOT EXISTS runs_nodeid ON runs (nodeid)")
+        self.conn.commit()
+
+    def record(self, nodeid, outcome, duration, retries=0):
+        self.conn.execute(
+            "INSERT INTO runs (nodeid, outcome, duration, retries, finished_at) VALUES (?, ?, ?, ?, ?)",
+            (nodeid, outcome, duration, retries, time.time()),
+        )
+        self.conn.commit()
+
+    def stats(self, last=20):
+        """Сводка по последним last прогонам каждого теста"""
+        # previous - результат следующего по времени прогона (в окне last)
+        rows = self.conn.execute(
+            "SELECT nodeid, COUNT(*), SUM(outcome = 'failed'),"
+            " SUM(retries > 0 AND outcome = 'passed'), SUM(outcome != previous), AVG(duration) FROM ("
+            " SELECT nodeid, outcome, retries, duration,"
+            "  ROW_NUMBER() OVER latest AS n, LAG(outcome) OVER latest AS previous"
+            " FROM runs WINDOW latest AS (PARTITION BY nodeid ORDER BY finished_at DESC))"
+            " WHERE n <= ? GROUP BY nodeid",
+            (last,),
+        )
+        result = {}
+        for nodeid, runs, failures, retried, changes, duration in rows:
+            flake_rate = (retried + (changes or 0)) / runs
+            result[nodeid] = {
+                "runs": runs,
+                "failures": failures,
+                "retried": retried,
+                "changes": changes or 0,
+                "flake_rate": round(flake_rate, 3),
+                "flaky": flake_rate > FLAKY_THRESHOLD,
+                "mean_duration": round(duration, 3),
+            }
+        return result
+
+    def order(self, nodeids):
+        """Нестабильные первыми, затем по убыванию средней длительности"""
+        stats = self.stats()
+
+        def key(nodeid):
+            s = stats.get(nodeid)
+            if s is None:
+                # Новые тесты - после известных: длительность неизвестна
+                return (1, 0.0, 0.0)
+            return (0 if s["flaky"] else 1, -s["flake_rate"], -s["mean_duration"])
+
+        return sorted(nodeids, key=key)
+
+    def close(self):
+        self.conn.close()
@@ -0,0 +1,154 @@
+"""Реестр локаторов страницы заказа, проверенных по test_data/zakaz.html.
+
+Страница разбирается один раз при импорте; каждый локатор проверяется
+при регистрации. Опечатка в ID падает сразу с UnknownLocatorError, а не
+через 10 с ожидания WebDriverWait. Проверяются локаторы By.ID и
+By.CLASS_NAME (включая классы, которые скрипт страницы создаёт сам).
+ID-локаторы один раз для каждого драйвера сверяются и с живым DOM: это
+делает BasePage при первом поиске, когда в драйвере открыта именно эта
+страница и она загружена.
+"""
+import os
+import re
+import weakref
+from functools import lru_cache
+from urllib.parse import unquote, urlparse
+from html.parser import HTMLParser
+
+from selenium.webdriver.common.by import By
+
+DEFAULT_PAGE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "test_data", "zakaz.html")
+
+# Разметка внутри <script>: шаблонные строки и className = '...'
+SCRIPT_ID_RE = re.compile(r"""\bid\s*=\s*["']([\w-]+)["']""")
+SCRIPT_CLASS_RE = re.compile(r"""\bclass(?:Name)?\s*=\s*["']([\w\s-]+)["']""")
+
+
+class UnknownLocatorError(LookupError):
+    pass
+
+
+class PageIndex:
+    """ID -> (тег, атрибуты) и множество классов страницы"""
+
+    def __init__(self):
+        self.ids = {}
+        self.classes = set()
+
+
+class _IndexParser(HTMLParser):
+    def __init__(self, index):
+        super().__init__()
+        self.index = index
+        self._in_script = False
+
+    def handle_starttag(self, tag, attrs):
+        attrs = dict(attrs)
+        if "id" in attrs:
+            self.index.ids[attrs["id"]] = (tag, attrs)
+        self.index.classes.update((attrs.get("class") or "").split())
+        self._in_script = tag == "script"
+
+    def handle_endtag(self, tag):
+        if tag == "script":
+            self._in_script = False
+
+    def handle_data(self, data):
+        if not self._in_script:
+            return
+        for element_id in SCRIPT_ID_RE.findall(data):
+            self.index.ids.setdefault(element_id, (None, {"id": element_id}))
+        for classes in SCRIPT_CLASS_RE.findall(data):
+            self.index.classes.update(classes.split())
+
+
+@lru_cache(maxsize=None)
+def parse_page(path):
+    """Индекс элементов страницы (разбирается один раз на файл)"""
+    index = PageIndex()
+    with open(path, encoding="utf-8") as f:
+        parser = _IndexParser(index)
+        parser.feed(f.read())
+        parser.close()
+    return index
+
+
+class LocatorRegistry:
+    def __init__(self, path=DEFAULT_PAGE):
+        self.index = parse_page(os.path.abspath(path))
+        self.page = os.path.basename(path)
+        self.locators = {}
+        # Драйвер -> локаторы, которых нет в его DOM (результат validate_live)
+        self.live_missing = weakref.WeakKeyDictionary()
+
+    def exists(self, by, value, driver=None):
+        """Есть ли элемент на странице; локаторы, которые не проверяются, считаются существующими"""
+        if driver is not None and (by, value) in self.live_missing.get(driver, ()):
+            return False
+        if by == By.ID:
+            return value in self.index.ids
+        if by == By.CLASS_NAME:
+            return value in self.index.classes
+        return True
+
+    def check(self, by, value, driver=None):
+        if not self.exists(by, value, driver):
+            raise UnknownLocatorError(f"Локатор {by}={value!r} не найден на странице")
+
+    def register(self, name, by, value):
+        """Проверяет и запоминает локатор, возвращает кортеж (by, value)"""
+        self.check(by, value)
+        self.locators[name] = (by, value)
+        return (by, value)
+
+    def element(self, element_id):
+        """Тег и атрибуты элемента по ID"""
+        try:
+            return self.index.ids[element_id]
+        except KeyError:
+            raise UnknownLocatorError(f"Элемент с id={element_id!r} не найден на странице")
+
+    def is_open(self, driver):
+        """Открыта ли в драйвере страница этого реестра"""
+        return os.path.basename(unquote(urlparse(driver.current_url).path)) == self.page
+
+    def live_checked(self, driver):
+        return driver in self.live_missing
+
+    def validate_live(self, driver):
+        """Одна проверка всех ID-локаторов по живому DOM драйвера.
+
+        Возвращает имена отсутствующих или None, если открыта другая
+        страница или она ещё не загружена: тогда ничего не запоминается.
+        """
+        if not self.is_open(driver):
+            return None
+        ids = {name: value for name, (by, value) in self.locators.items() if by == By.ID}
+        found = driver.execute_script(
+            "if (document.readyState !== 'complete') return null;"
+            "return arguments[0].filter(id => document.getElementById(id) !== null);",
+            list(ids.values()),
+        )
+        if found is None:
+            return None
+        missing = [name for name, value in ids.items() if value not in found]
+        self.live_missing[driver] = {self.locators[name] for name in missing}
+        return missing
+
+
+zakaz = LocatorRegistry()
+
+# Форма оформления заказа
+FULL_NAME_INPUT = zakaz.register("FULL_NAME_INPUT", By.ID, "full-name")
+PHONE_INPUT = zakaz.register("PHONE_INPUT", By.ID, "phone")
+ADDRESS_INPUT = zakaz.register("ADDRESS_INPUT", By.ID, "address")
+AGREEMENT_CHECKBOX = zakaz.register("AGREEMENT_CHECKBOX", By.ID, "agreement-checkbox")
+CHECKOUT_BUTTON = zakaz.register("CHECKOUT_BUTTON", By.ID, "checkout-btn")
+# Ошибки валидации
+FULL_NAME_ERROR = zakaz.register("FULL_NAME_ERROR", By.ID, "full-name-error")
+PHONE_ERROR = zakaz.register("PHONE_ERROR", By.ID, "phone-error")
+ADDRESS_ERROR = zakaz.register("ADDRESS_ERROR", By.ID, "address-error")
+AGREEMENT_ERROR = zakaz.register("AGREEMENT_ERROR", By.ID, "agreement-error")
+# Корзина (элементы создаются скриптом страницы)
+CART_ITEM = zakaz.register("CART_ITEM", By.CLASS_NAME, "cart-item")
+EMPTY_CART = zakaz.register("EMPTY_CART", By.CLASS_NAME, "empty-cart")
@@ -0,0 +1,192 @@
+"""Параллельный запуск тестов: самые долгие - первыми (LPT).
+
+Длительности берутся из истории прогонов (flake_history). Каждый
+воркер забирает из общей очереди следующий по длительности тест, так
+что освободившийся раньше воркер сразу получает новую работу.
+Нестабильные тесты (по истории) идут отдельной фазой до остальных, по
+одному, без соседних браузеров. Результаты всех процессов
+пишутся в reports/results.sqlite, по ним строится постраничный отчёт
+reports/results/index.html. В конце печатается прогнозный и
+фактический makespan.
+
+    python -m pages.lpt_scheduler tests/ --workers 2 [-- доп. аргументы pytest]
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import threading
+import time
+
+from .flake_history import DEFAULT_PATH, FlakeHistory
+from .result_report import build_report
+from .result_store import new_run_id
+
+# Оценка для теста без истории, если история пуста вовсе
+DEFAULT_DURATION = 30.0
+# Запуск pytest в отдельном процессе на каждый тест, с
+STARTUP_OVERHEAD = 1.0
+
+
+# Код pytest "тесты не найдены"
+NO_TESTS_COLLECTED = 5
+
+
+def collect(paths, extra_args=()):
+    """Список nodeid тестов (включая параметризованные варианты).
+
+    Если pytest не смог собрать тесты (например, модуль не импортируется),
+    поднимается CalledProcessError с его выводом: иначе такие файлы
+    молча выпали бы из прогона.
+    """
+    args = [sys.executable, "-m", "pytest", "--collect-only", "-q", *paths, *extra_args]
+    result = subprocess.run(args, capture_output=True, text=True)
+    if result.returncode == NO_TESTS_COLLECTED:
+        return []
+    if result.returncode != 0:
+        raise subprocess.CalledProcessError(result.returncode, args, result.stdout, result.stderr)
+    return [line.strip() for line in result.stdout.splitlines() if "::" in line]
+
+
+def estimate(nodeids, stats):
+    """Ожидаемая длительность каждого теста; неизвестные - по медиане известных"""
+    known = [s["mean_duration"] for s in stats.values()]
+    fallback = statistics.median(known) if known else DEFAULT_DURATION
+    return {nodeid: stats[nodeid]["mean_duration"] if nodeid in stats else fallback
+            for nodeid in nodeids}
+
+
+def plan(nodeids, durations, stats):
+    """Две очереди по убыванию длительности: нестабильные (выполняются
+    последовательно, в изоляции) и остальные (параллельно)"""
+    def key(nodeid):
+        return -durations[nodeid]
+    isolated = [n for n in nodeids if stats.get(n, {}).get("flaky", False)]
+    parallel = [n for n in nodeids if not stats.get(n, {}).get("flaky", False)]
+    return sorted(isolated, key=key), sorted(parallel, key=key)
+
+
+def predict_makespan(queue, durations, workers, overhead=STARTUP_OVERHEAD):
+    """Моделирует списочное планирование: тест уходит наименее загруженному воркеру"""
+    loads = [0.0] * workers
+    for nodeid in queue:
+        i = loads.index(min(loads))
+        loads[i] += durations[nodeid] + overhead
+    return max(loads) if loads else 0.0
+
+
+def predict_total(isolated, parallel, durations, workers, overhead=STARTUP_OVERHEAD):
+    """Прогноз makespan: последовательная фаза плюс параллельная"""
+    serial = sum(durations[nodeid] + overhead for nodeid in isolated)
+    return serial + predict_makespan(parallel, durations, workers, overhead)
+
+
+def run(queue, workers, report_dir, extra_args=()):
+    """Выполняет очередь на workers воркерах, возвращает фактические длительности"""
+    lock = threading.Lock()
+    pending = list(queue)
+    actual = {}
+    failed = []
+
+    def worker(index):
+        while True:
+            with lock:
+                if not pending:
+                    return
+                nodeid = pending.pop(0)
+            args = [
+                sys.executable, "-m", "pytest", "-q", nodeid,
+                "--no-history-order",
+                f"--result-store={os.path.join(report_dir, 'results.sqlite')}",
+                *extra_args,
+            ]
+            started = time.time()
+            code = subprocess.run(args).returncode
+            elapsed = time.time() - started
+            with lock:
+                actual[nodeid] = elapsed
+                if code != 0:
+                    failed.append(nodeid)
+            print(f"[воркер {index}] {nodeid}: {elapsed:.1f} с, код {code}")
+
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(workers)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return actual, failed
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else list(argv)
+    # Всё после "--" передаётся pytest как есть
+    extra_args = []
+    if "--" in argv:
+        split = argv.index("--")
+        argv, extra_args = argv[:split], argv[split + 1:]
+
+    parser = argparse.ArgumentParser(description="Параллельный запуск тестов по LPT")
+    parser.add_argument("paths", nargs="*", default=["tests"])
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--history", default=DEFAULT_PATH)
+    parser.add_argument("--report-dir", default="reports")
+    parser.add_argument("--overhead", type=float, default=STARTUP_OVERHEAD,
+                        help="накладные расходы на запуск pytest для одного теста, с")
+    args = parser.parse_args(argv)
+    extra_args.append(f"--flake-history={args.history}")
+
+    os.makedirs(args.report_dir, exist_ok=True)
+    # Фильтры pytest (-k, -m) должны действовать уже при сборе
+    try:
+        nodeids = collect(args.paths, extra_args)
+    except subprocess.CalledProcessError as e:
+        print(f"Ошибка сбора тестов (код pytest {e.returncode}):", file=sys.stderr)
+        print(e.output + e.stderr, file=sys.stderr)
+        return e.returncode
+    if not nodeids:
+        print("Тесты не найдены")
+        return NO_TESTS_COLLECTED
+
+    history = FlakeHistory(args.history)
+    stats = history.stats()
+    history.close()
+    durations = estimate(nodeids, stats)
+    isolated, parallel = plan(nodeids, durations, stats)
+    queue = isolated + parallel
+    workers = max(1, min(args.workers, len(parallel) or 1))
+    predicted = predict_total(isolated, parallel, durations, workers, args.overhead)
+    print(f"Тестов: {len(queue)} (в изоляции: {len(isolated)}), воркеров: {workers}, "
+          f"прогноз makespan: {predicted:.1f} с")
+
+    # Общий идентификатор прогона для всех процессов pytest
+    os.environ.setdefault("UI_RUN_ID", new_run_id())
+    # Скриншоты и прочие файлы тестов - рядом с отчётом
+    os.environ.setdefault("UI_ARTIFACTS_DIR", os.path.join(args.report_dir, "artifacts"))
+    started = time.time()
+    actual, failed = {}, []
+    for phase, phase_workers in ((isolated, 1), (parallel, workers)):
+        phase_actual, phase_failed = run(phase, phase_workers, args.report_dir, extra_args)
+        actual.update(phase_actual)
+        failed += phase_failed
+    makespan = time.time() - started
+    build_report(os.path.join(args.report_dir, "results.sqlite"),
+                 os.path.join(args.report_dir, "results"), os.environ["UI_RUN_ID"])
+
+    print("=" * 60)
+    print(f"{'Тест':60} {'прогноз':>8} {'факт':>8}")
+    for nodeid in queue:
+        print(f"{nodeid[:60]:60} {durations[nodeid] + args.overhead:8.1f} {actual.get(nodeid, 0):8.1f}")
+    print("-" * 60)
+    print(f"Makespan: прогноз {predicted:.1f} с, факт {makespan:.1f} с")
+    print(f"Сумма длительностей: {sum(actual.values()):.1f} с")
+    if failed:
+        print(f"Упали: {len(failed)}")
+        for nodeid in failed:
+            print(f"  {nodeid}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
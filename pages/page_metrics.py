@@ -0,0 +1,144 @@
+"""Сбор метрик загрузки страницы после каждого driver.get.
+
+Navigation Timing, first/largest contentful paint, long tasks и время
+загрузки/декодирования картинок. Замеры копятся по сценариям (тестам
+pytest) только до конца теста: conftest.py сворачивает их в сводку и
+пишет в хранилище результатов (и в pytest-html, если он включён).
+"""
+import time
+from collections import defaultdict
+
+from .command_trace import current_test_name
+
+# Асинхронный скрипт: буферизованные PerformanceObserver отдают записи
+# в следующей задаче, поэтому результат возвращается через setTimeout
+METRICS_SCRIPT = """
+const done = arguments[arguments.length - 1];
+const result = {navigation: null, paint: {}, lcp: null, long_tasks: [], images: []};
+
+const nav = performance.getEntriesByType('navigation')[0];
+if (nav) {
+    result.navigation = {
+        dns: nav.domainLookupEnd - nav.domainLookupStart,
+        connect: nav.connectEnd - nav.connectStart,
+        ttfb: nav.responseStart - nav.requestStart,
+        response: nav.responseEnd - nav.responseStart,
+        dom_interactive: nav.domInteractive,
+        dom_content_loaded: nav.domContentLoadedEventEnd,
+        dom_content_loaded_handlers: nav.domContentLoadedEventEnd - nav.domContentLoadedEventStart,
+        load: nav.loadEventEnd,
+        transfer_size: nav.transferSize
+    };
+}
+performance.getEntriesByType('paint').forEach(e => { result.paint[e.name] = e.startTime; });
+
+function observe(type, cb) {
+    try {
+        new PerformanceObserver(list => list.getEntries().forEach(cb))
+            .observe({type: type, buffered: true});
+    } catch (e) { /* тип не поддерживается браузером */ }
+}
+observe('largest-contentful-paint', e => { result.lcp = e.startTime; });
+observe('longtask', e => { result.long_tasks.push({start: e.startTime, duration: e.duration}); });
+
+const resources = {};
+performance.getEntriesByType('resource')
+    .filter(e => e.initiatorType === 'img')
+    .forEach(e => { resources[e.name] = e; });
+
+const decodes = Array.from(document.images).map(img => {
+    const t0 = performance.now();
+    const timing = resources[img.currentSrc || img.src];
+    const base = {
+        src: img.getAttribute('src'),
+        load: timing ? timing.responseEnd - timing.startTime : null,
+        size: timing ? timing.encodedBodySize : null
+    };
+    return img.decode()
+        .then(() => Object.assign(base, {decode: performance.now() - t0}))
+        .catch(() => Object.assign(base, {decode: null, error: true}));
+});
+
+Promise.all(decodes).then(images => {
+    result.images = images;
+    setTimeout(() => done(result), 50);
+});
+"""
+
+# Метрики по сценариям: имя теста -> список замеров (по одному на driver.get)
+scenarios = defaultdict(list)
+
+
+def collect_page_metrics(driver):
+    """Снимает метрики текущей страницы"""
+    metrics = driver.execute_async_script(METRICS_SCRIPT)
+    metrics["url"] = driver.current_url
+    return metrics
+
+
+class PageMetricsCollector:
+    """Обёртка над driver.get: после каждой загрузки снимает метрики"""
+
+    def __init__(self, driver):
+        self.driver = driver
+        self._get = driver.get
+        driver.get = self._get_with_metrics
+
+    def _get_with_metrics(self, url):
+        started = time.time()
+        self._get(url)
+        try:
+            metrics = collect_page_metrics(self.driver)
+        except Exception as e:
+            # Метрики не должны ронять тест
+            print(f"Не удалось снять метрики страницы: {e}")
+            return
+        metrics["get_sec"] = round(time.time() - started, 3)
+        scenarios[current_test_name() or "<вне теста>"].append(metrics)
+
+
+def collect_metrics_on_get(driver):
+    """Включает сбор метрик после каждого driver.get"""
+    return PageMetricsCollector(driver)
+
+
+def summarize(samples):
+    """Агрегирует замеры одного сценария"""
+    def values(getter):
+        result = []
+        for sample in samples:
+            try:
+                value = getter(sample)
+            except (KeyError, TypeError):
+                continue
+            if value is not None:
+                result.append(value)
+        return result
+
+    def stats(items):
+        if not items:
+            return None
+        return {"min": round(min(items), 2), "max": round(max(items), 2),
+                "mean": round(sum(items) / len(items), 2)}
+
+    def decode_total(sample):
+        # Картинки, которые не удалось декодировать, в сумму не входят
+        times = [i["decode"] for i in sample["images"] if i.get("decode") is not None]
+        return sum(times) if times else None
+
+    decodes = values(decode_total)
+    return {
+        "loads": len(samples),
+        "get_sec": stats(values(lambda s: s["get_sec"])),
+        "dom_content_loaded_ms": stats(values(lambda s: s["navigation"]["dom_content_loaded"])),
+        "dom_content_loaded_handlers_ms": stats(values(lambda s: s["navigation"]["dom_content_loaded_handlers"])),
+        "load_ms": stats(values(lambda s: s["navigation"]["load"])),
+        "first_contentful_paint_ms": stats(values(lambda s: s["paint"]["first-contentful-paint"])),
+        "largest_contentful_paint_ms": stats(values(lambda s: s["lcp"])),
+        "long_tasks": sum(len(s.get("long_tasks", [])) for s in samples),
+        "long_tasks_ms": round(sum(t["duration"] for s in samples for t in s.get("long_tasks", [])), 2),
+        "images": max(values(lambda s: len(s["images"])), default=0),
+        "image_decode_total_ms": stats(decodes),
+        "image_decode_errors": sum(1 for s in samples for i in s.get("images", []) if i.get("error")),
+    }
+
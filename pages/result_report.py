@@ -0,0 +1,154 @@
+"""HTML-отчёт по хранилищу результатов с разбиением на страницы.
+
+Результаты читаются курсором порциями по --page-size, поэтому отчёт
+строится за постоянную память при любом числе кейсов. Сводки метрик
+загрузки страниц выводятся в таблице и выгружаются в page_metrics.json.
+
+    python -m pages.result_report results.sqlite --out reports/results [--run RUN_ID]
+"""
+import argparse
+import html
+import json
+import os
+import sqlite3
+
+from .result_store import DEFAULT_PATH
+
+STYLE = """
+body { font-family: 'Segoe UI', Tahoma, sans-serif; margin: 20px; color: #333; }
+table { border-collapse: collapse; width: 100%; }
+th, td { border-bottom: 1px solid #ddd; padding: 4px 8px; text-align: left; vertical-align: top; }
+.passed { color: #2e7d32; } .failed { color: #c62828; } .skipped { color: #f9a825; }
+pre { white-space: pre-wrap; font-size: 12px; }
+"""
+
+
+def page_name(number):
+    return f"page-{number:04d}.html"
+
+
+def write_html(path, title, body):
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(f"<!DOCTYPE html><html lang=\"ru\"><head><meta charset=\"UTF-8\">"
+                f"<title>{html.escape(title)}</title><style>{STYLE}</style></head>"
+                f"<body><h1>{html.escape(title)}</h1>{body}</body></html>")
+
+
+def latest_run(conn):
+    row = conn.execute("SELECT run_id FROM results ORDER BY id DESC LIMIT 1").fetchone()
+    return row[0] if row else None
+
+
+def result_rows(conn, run_id):
+    """Итоговые записи тестов: фаза call, либо упавший/пропущенный setup/teardown"""
+    return conn.execute(
+        "SELECT nodeid, outcome, duration, longrepr, artifacts, metrics FROM results"
+        " WHERE run_id = ? AND (phase = 'call' OR outcome != 'passed') ORDER BY id",
+        (run_id,),
+    )
+
+
+def render_metrics(metrics):
+    """Ключевые метрики страницы и полная сводка под спойлером"""
+    if not metrics:
+        return ""
+    summary = json.loads(metrics)
+
+    def mean(key):
+        value = summary.get(key)
+        return f"{value['mean']:.0f}" if value else "-"
+
+    return (f"DCL {mean('dom_content_loaded_ms')} мс, load {mean('load_ms')} мс, "
+            f"LCP {mean('largest_contentful_paint_ms')} мс, long tasks {summary.get('long_tasks', 0)}"
+            f"<details><summary>все метрики</summary><pre>"
+            f"{html.escape(json.dumps(summary, ensure_ascii=False, indent=2))}</pre></details>")
+
+
+def render_row(row, out_dir):
+    nodeid, outcome, duration, longrepr, artifacts, metrics = row
+    links = ""
+    for path in json.loads(artifacts) if artifacts else []:
+        href = os.path.relpath(path, out_dir)
+        links += f"<a href=\"{html.escape(href)}\">{html.escape(os.path.basename(path))}</a> "
+    details = f"<details><summary>ошибка</summary><pre>{html.escape(longrepr)}</pre></details>" if longrepr else ""
+    return (f"<tr><td>{html.escape(nodeid)}{details}</td>"
+            f"<td class=\"{outcome}\">{outcome}</td><td>{duration:.2f}</td>"
+            f"<td>{render_metrics(metrics)}</td><td>{links}</td></tr>")
+
+
+def write_metrics_json(conn, run_id, path):
+    """Выгружает сводки метрик страниц по тестам, по одной записи за раз"""
+    rows = conn.execute(
+        "SELECT nodeid, metrics FROM results WHERE run_id = ? AND metrics IS NOT NULL ORDER BY id",
+        (run_id,),
+    )
+    with open(path, "w", encoding="utf-8") as f:
+        f.write("{")
+        for i, (nodeid, metrics) in enumerate(rows):
+            f.write(("," if i else "") + f"\n  {json.dumps(nodeid, ensure_ascii=False)}: {metrics}")
+        f.write("\n}\n")
+
+
+def build_report(db_path, out_dir, run_id=None, page_size=200):
+    """Пишет index.html со сводкой и страницы с результатами; возвращает число страниц"""
+    os.makedirs(out_dir, exist_ok=True)
+    conn = sqlite3.connect(db_path)
+    run_id = run_id or latest_run(conn)
+    if run_id is None:
+        conn.close()
+        write_html(os.path.join(out_dir, "index.html"), "Результаты тестов", "<p>Нет результатов</p>")
+        return 0
+
+    rows = result_rows(conn, run_id)
+    header = "<tr><th>Тест</th><th>Результат</th><th>Время, с</th><th>Страница</th><th>Файлы</th></tr>"
+    pages = 0
+    # Держим в памяти не больше двух порций: текущую и следующую
+    chunk = rows.fetchmany(page_size)
+    while chunk:
+        following = rows.fetchmany(page_size)
+        pages += 1
+        nav = "<p><a href=\"index.html\">Сводка</a>"
+        if pages > 1:
+            nav += f" | <a href=\"{page_name(pages - 1)}\">&larr; назад</a>"
+        if following:
+            nav += f" | <a href=\"{page_name(pages + 1)}\">вперёд &rarr;</a>"
+        nav += "</p>"
+        body = nav + "<table>" + header + "".join(render_row(r, out_dir) for r in chunk) + "</table>" + nav
+        write_html(os.path.join(out_dir, page_name(pages)), f"Результаты {run_id}, стр. {pages}", body)
+        chunk = following
+
+    write_metrics_json(conn, run_id, os.path.join(out_dir, "page_metrics.json"))
+
+    # Сводка считается в SQLite, без загрузки строк в память
+    totals = conn.execute(
+        "SELECT outcome, COUNT(*), SUM(duration) FROM results"
+        " WHERE run_id = ? AND (phase = 'call' OR outcome != 'passed') GROUP BY outcome",
+        (run_id,),
+    ).fetchall()
+    slowest = conn.execute(
+        "SELECT nodeid, duration FROM results WHERE run_id = ? AND phase = 'call'"
+        " ORDER BY duration DESC LIMIT 20",
+        (run_id,),
+    ).fetchall()
+    conn.close()
+
+    summary = "<table><tr><th>Результат</th><th>Тестов</th><th>Время, с</th></tr>"
+    summary += "".join(f"<tr><td class=\"{o}\">{o}</td><td>{n}</td><td>{d:.1f}</td></tr>" for o, n, d in totals)
+    summary += "</table><h2>Самые долгие</h2><table>"
+    summary += "".join(f"<tr><td>{html.escape(n)}</td><td>{d:.2f}</td></tr>" for n, d in slowest)
+    summary += "</table><h2>Страницы</h2><p>"
+    summary += " ".join(f"<a href=\"{page_name(i)}\">{i}</a>" for i in range(1, pages + 1))
+    summary += "</p>"
+    write_html(os.path.join(out_dir, "index.html"), f"Результаты тестов ({run_id})", summary)
+    return pages
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="HTML-отчёт по хранилищу результатов")
+    parser.add_argument("db", nargs="?", default=DEFAULT_PATH)
+    parser.add_argument("--out", default="reports/results")
+    parser.add_argument("--run", help="идентификатор прогона (по умолчанию - последний)")
+    parser.add_argument("--page-size", type=int, default=200)
+    args = parser.parse_args()
+    count = build_report(args.db, args.out, args.run, args.page_size)
+    print(f"Отчёт: {os.path.join(args.out, 'index.html')} ({count} стр.)")
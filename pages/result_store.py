@@ -0,0 +1,91 @@
+"""Потоковое хранилище результатов тестов (SQLite, только добавление).
+
+Каждый результат пишется сразу по завершении теста, поэтому память
+процесса не растёт с числом кейсов. Скриншоты и прочие файлы хранятся
+ссылками (путями), метрики загрузки страниц - сводкой по тесту. Отчёт
+строится отдельно: python -m pages.result_report
+"""
+import json
+import os
+import re
+import sqlite3
+import time
+from collections import defaultdict
+
+from .command_trace import current_test_name
+
+DEFAULT_PATH = "results.sqlite"
+
+# Длинные трейсбеки обрезаются: в отчёте достаточно начала и конца
+MAX_LONGREPR = 20000
+
+# Файлы, приложенные к тестам до записи их результата
+_artifacts = defaultdict(list)
+
+
+def slug(nodeid):
+    """nodeid теста в виде, пригодном для имени файла"""
+    return re.sub(r"[^\w.-]+", "_", nodeid).strip("_")
+
+
+def artifact_path(name):
+    """Путь для файла текущего теста: параллельные процессы не перезаписывают друг друга"""
+    directory = os.environ.get("UI_ARTIFACTS_DIR", "artifacts")
+    os.makedirs(directory, exist_ok=True)
+    return os.path.join(directory, f"{slug(current_test_name() or 'outside')}-{name}")
+
+
+def attach(path):
+    """Прикладывает файл (например, скриншот) к текущему тесту"""
+    _artifacts[current_test_name() or "<вне теста>"].append(os.path.abspath(path))
+
+
+def new_run_id():
+    return time.strftime("%Y%m%d-%H%M%S") + f"-{os.getpid()}"
+
+
+class ResultStore:
+    def __init__(self, path=DEFAULT_PATH, run_id=None):
+        self.path = path
+        self.run_id = run_id or new_run_id()
+        # Несколько процессов (воркеры планировщика) пишут в одну базу
+        self.conn = sqlite3.connect(path, timeout=30)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS results ("
+            " id INTEGER PRIMARY KEY,"
+            " run_id TEXT NOT NULL,"
+            " nodeid TEXT NOT NULL,"
+            " phase TEXT NOT NULL,"
+            " outcome TEXT NOT NULL,"
+            " duration REAL NOT NULL,"
+            " finished_at REAL NOT NULL,"
+            " longrepr TEXT,"
+            " artifacts TEXT,"
+            " metrics TEXT)"
+        )
+        self.conn.execute("CREATE INDEX IF NOT EXISTS results_run ON results (run_id, id)")
+        self.conn.commit()
+
+    def add(self, report):
+        """Записывает отчёт pytest о фазе теста"""
+        longrepr = None
+        if report.failed:
+            longrepr = str(report.longrepr)
+            if len(longrepr) > MAX_LONGREPR:
+                half = MAX_LONGREPR // 2
+                longrepr = longrepr[:half] + "\n...\n" + longrepr[-half:]
+        artifacts = _artifacts.pop(report.nodeid, [])
+        # Сводка метрик страницы, приложенная к отчёту в conftest.py
+        metrics = getattr(report, "page_metrics", None)
+        self.conn.execute(
+            "INSERT INTO results (run_id, nodeid, phase, outcome, duration, finished_at, longrepr, artifacts, metrics)"
+            " VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            (self.run_id, report.nodeid, report.when, report.outcome, report.duration,
+             time.time(), longrepr, json.dumps(artifacts, ensure_ascii=False) if artifacts else None,
+             json.dumps(metrics, ensure_ascii=False) if metrics else None),
+        )
+        self.conn.commit()
+
+    def close(self):
+        self.conn.close()
@@ -0,0 +1,77 @@
+"""Политика повторов для действий со страницей.
+
+Сбой классифицируется по типу исключения, и повторяется только упавшее
+действие, а не весь тест. Число повторов по каждому тесту копится в
+stats и попадает в историю нестабильных тестов (см. flake_history).
+"""
+import time
+from collections import Counter, defaultdict
+
+from selenium.common.exceptions import (
+    ElementClickInterceptedException,
+    NoAlertPresentException,
+    StaleElementReferenceException,
+    TimeoutException,
+)
+
+from .command_trace import current_test_name
+
+# Порядок важен: проверяется первое подходящее исключение
+FAILURE_KINDS = (
+    (StaleElementReferenceException, "stale"),
+    (ElementClickInterceptedException, "intercepted"),
+    (NoAlertPresentException, "no_alert"),
+    (TimeoutException, "timeout"),
+)
+
+# Сколько всего попыток даётся действию при сбое каждого вида.
+# Таймаут уже включает ожидание WebDriverWait, поэтому не повторяется
+DEFAULT_ATTEMPTS = {
+    "stale": 3,
+    "intercepted": 2,
+    "no_alert": 2,
+    "timeout": 1,
+}
+
+# Повторы по тестам: имя теста -> Counter(вид сбоя -> число повторов)
+stats = defaultdict(Counter)
+
+
+def classify(error):
+    """Вид сбоя или None, если сбой не подлежит повтору"""
+    for exc_type, kind in FAILURE_KINDS:
+        if isinstance(error, exc_type):
+            return kind
+    return None
+
+
+class RetryPolicy:
+    def __init__(self, attempts=None, delay=0.2):
+        self.attempts = dict(DEFAULT_ATTEMPTS, **(attempts or {}))
+        self.delay = delay
+
+    def run(self, action, fallback=None):
+        """Выполняет action, повторяя его при классифицированных сбоях.
+
+        fallback(kind) - запасное действие, которое выполняется вместо
+        action на повторе (например, клик через JavaScript).
+        """
+        # Попытки считаются по каждому виду сбоя отдельно: stale на первой
+        # попытке не отнимает попытку у no_alert на следующей
+        failures = Counter()
+        step = action
+        while True:
+            try:
+                return step()
+            except Exception as e:
+                kind = classify(e)
+                if kind is None:
+                    raise
+                failures[kind] += 1
+                if failures[kind] >= self.attempts.get(kind, 1):
+                    raise
+                stats[current_test_name() or "<вне теста>"][kind] += 1
+                print(f"Повтор действия ({kind}), попытка {failures[kind] + 1}")
+                if fallback is not None:
+                    step = lambda kind=kind: fallback(kind)
+                time.sleep(self.delay)
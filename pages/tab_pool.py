@@ -0,0 +1,197 @@
+"""Несколько изолированных сессий (вкладок) в одном браузере.
+
+Каждая вкладка привязана к своему ContactPage. Поток, вошедший в
+mux.session(i), работает со вкладкой i: каждая команда драйвера перед
+выполнением переключается на нужное окно. Команды разных потоков
+выполняются по очереди, но сценарии идут вперемешку, а браузер один.
+
+    mux = TabMultiplexer(driver, 3)
+    with mux.session(0) as page:
+        page.driver.get(url)
+        page.fill_full_name("Иван")
+
+localStorage общий для вкладок одного origin. Каждой вкладке он
+подставляется до выполнения её команд и до скриптов страницы при
+навигации. Скрипты самой страницы в фоновых вкладках при этом видят
+содержимое вкладки, которая выполняла команды последней.
+"""
+import json
+import threading
+from contextlib import contextmanager
+
+from selenium.common.exceptions import NoAlertPresentException, WebDriverException
+from selenium.webdriver.chromium.webdriver import ChromiumDriver
+from selenium.webdriver.remote.command import Command
+
+from .contacts_page import ContactPage
+
+# localStorage общий для вкладок одного origin, поэтому при переключении
+# содержимое сохраняется за прежней вкладкой и восстанавливается для новой.
+# Скрипты выполняются только во вкладке без открытого alert: иначе
+# chromedriver (unhandledPromptBehavior по умолчанию) закроет чужой alert.
+# На about:blank localStorage недоступен - обмен откладывается (null)
+SWAP_STORAGE_SCRIPT = """
+let storage;
+try {
+    storage = window.localStorage;
+} catch (e) {
+    if (e.name === 'SecurityError') return null;
+    throw e;
+}
+const saved = JSON.stringify(Object.assign({}, storage));
+storage.clear();
+const data = JSON.parse(arguments[0] || '{}');
+Object.keys(data).forEach(k => storage.setItem(k, data[k]));
+return {saved: saved};
+"""
+
+# Навигация вкладки, которая ещё не получила свой localStorage (например,
+# с about:blank): обмен делается в новом документе до скриптов страницы
+# (Page.addScriptToEvaluateOnNewDocument), а содержимое прежнего владельца
+# откладывается в sessionStorage этой вкладки, откуда его забирает TAKE_SAVED_SCRIPT
+STASH_KEY = "__tab_pool_saved"
+NEW_DOCUMENT_SWAP_SCRIPT = """
+(() => {
+    try {
+        if (sessionStorage.getItem('%(key)s') !== null) return;
+        sessionStorage.setItem('%(key)s', JSON.stringify(Object.assign({}, localStorage)));
+        localStorage.clear();
+        const data = JSON.parse(%(data)s || '{}');
+        Object.keys(data).forEach(k => localStorage.setItem(k, data[k]));
+    } catch (e) {}
+})();
+"""
+TAKE_SAVED_SCRIPT = """
+try {
+    const saved = sessionStorage.getItem('%(key)s');
+    sessionStorage.removeItem('%(key)s');
+    return saved;
+} catch (e) {
+    return null;
+}
+""" % {"key": STASH_KEY}
+
+
+class TabSession:
+    """Вкладка браузера и привязанная к ней страница"""
+
+    def __init__(self, handle, page):
+        self.handle = handle
+        self.page = page
+        self.storage = None
+
+
+class TabMultiplexer:
+    """Маршрутизирует команды драйвера во вкладку текущего потока"""
+
+    def __init__(self, driver, size, page_class=ContactPage, isolate_storage=True):
+        self.driver = driver
+        self.isolate_storage = isolate_storage
+        self._lock = threading.RLock()
+        self._local = threading.local()
+
+        handles = [driver.current_window_handle]
+        for _ in range(size - 1):
+            driver.switch_to.new_window("tab")
+            handles.append(driver.current_window_handle)
+        self.sessions = [TabSession(handle, page_class(driver)) for handle in handles]
+        self._active = self.sessions[-1]
+        # Чьё содержимое сейчас лежит в localStorage
+        self._storage_owner = self._active
+        # (вкладка, прежний владелец), пока содержимое прежнего владельца
+        # лежит в sessionStorage вкладки после навигации
+        self._stash = None
+        # CDP нужен для подмены localStorage до скриптов страницы
+        self._cdp = isinstance(driver, ChromiumDriver)
+
+        self._execute = driver.execute
+        driver.execute = self._routed_execute
+
+    def _routed_execute(self, driver_command, params=None):
+        session = getattr(self._local, "session", None)
+        if session is None:
+            return self._execute(driver_command, params)
+        with self._lock:
+            self._activate(session)
+            if (driver_command == Command.GET and self.isolate_storage and self._cdp
+                    and self._storage_owner is not session):
+                return self._get_isolated(session, params)
+            return self._execute(driver_command, params)
+
+    def _activate(self, session):
+        if self._active is not session:
+            self._execute(Command.SWITCH_TO_WINDOW, {"handle": session.handle})
+            self._active = session
+        if not self.isolate_storage:
+            return
+        if self._stash is not None:
+            # Пока содержимое прежнего владельца не забрано, других обменов нет
+            if self._stash[0] is session and not self._alert_open():
+                self._take_stash()
+            return
+        # Обмен localStorage делается из новой вкладки: прежняя могла остаться
+        # с открытым alert. Если alert открыт в новой - обмен откладывается до
+        # первой команды после его закрытия (так же - на about:blank)
+        if self._storage_owner is not session and not self._alert_open():
+            swapped = self._execute(Command.W3C_EXECUTE_SCRIPT,
+                                    {"script": SWAP_STORAGE_SCRIPT, "args": [session.storage]}).get("value")
+            if swapped is not None:
+                self._storage_owner.storage = swapped["saved"]
+                self._storage_owner = session
+
+    def _cdp_command(self, cmd, params):
+        return self._execute("executeCdpCommand", {"cmd": cmd, "params": params})["value"]
+
+    def _get_isolated(self, session, params):
+        """Навигация, при которой страница сразу видит localStorage вкладки"""
+        source = NEW_DOCUMENT_SWAP_SCRIPT % {"key": STASH_KEY, "data": json.dumps(session.storage)}
+        script = self._cdp_command("Page.addScriptToEvaluateOnNewDocument", {"source": source})
+        try:
+            return self._execute(Command.GET, params)
+        finally:
+            self._cdp_command("Page.removeScriptToEvaluateOnNewDocument", {"identifier": script["identifier"]})
+            self._stash = (session, self._storage_owner)
+            self._storage_owner = session
+            # Страница могла открыть alert при загрузке - тогда позже
+            if not self._alert_open():
+                self._take_stash()
+
+    def _take_stash(self):
+        session, previous = self._stash
+        saved = self._execute(Command.W3C_EXECUTE_SCRIPT, {"script": TAKE_SAVED_SCRIPT, "args": []}).get("value")
+        if saved is None:
+            # Новый документ не загрузился - обмена не было
+            self._storage_owner = previous
+        else:
+            previous.storage = saved
+        self._stash = None
+
+    def _alert_open(self):
+        try:
+            self._execute(Command.W3C_GET_ALERT_TEXT)
+        except NoAlertPresentException:
+            return False
+        return True
+
+    @contextmanager
+    def session(self, index):
+        """Привязывает текущий поток к вкладке index и отдаёт её страницу"""
+        session = self.sessions[index]
+        self._local.session = session
+        try:
+            yield session.page
+        finally:
+            # Неразобранный alert не должен мешать следующему сценарию
+            try:
+                session.page.driver.switch_to.alert.dismiss()
+            except (NoAlertPresentException, WebDriverException):
+                pass
+            self._local.session = None
+
+    def close(self):
+        """Закрывает дополнительные вкладки и снимает маршрутизацию"""
+        self.driver.execute = self._execute
+        for session in self.sessions[1:]:
+            self._execute(Command.SWITCH_TO_WINDOW, {"handle": session.handle})
+            self._execute(Command.CLOSE)
+        self._execute(Command.SWITCH_TO_WINDOW, {"handle": self.sessions[0].handle})
@@ -1,71 +1,15 @@
 from selenium import webdriver #модуль автоматизации для браузера
-from selenium.webdriver.common.by import By #модуль для поиска элементов на странице
-from selenium.webdriver.support.ui import WebDriverWait #класс для ожидания в браузере
-from selenium.webdriver.support import expected_conditions as EC #набор условий
+from selenium.common.exceptions import NoAlertPresentException #alert не появился
 import time #модуль для работы со временем
 import os #работа с адресацией
+import sys #путь поиска модулей
 
-class BasePage:
-    def __init__(self, driver): #инициализация страницы
-        self.driver = driver #экземпляр драйвера
-        self.wait = WebDriverWait(driver, 10) #ожидание открытия браузера
-    def find_element(self, by, value): #функция поиска элемента
-        return self.wait.until(EC.presence_of_element_located((by, value)))
-    def find_clickable_element(self, by, value): #функция поиска интерактивного элемента
-        return self.wait.until(EC.element_to_be_clickable((by, value)))
-    def click(self, by, value): #функция клика 
-        element = self.find_clickable_element(by, value) #поиск элемента по значению
-        self.driver.execute_script("arguments[0].scrollIntoView({block: 'center'});", element)#прокрутка при поиске
-        time.sleep(0.5)
-        element.click()
-    def send_keys(self, by, value, text):#функиця ввода
-        element = self.find_element(by, value)
-        element.clear()
-        element.send_keys(text)
+# при запуске как скрипта (python pages/test_zakaz.py) пакет pages ищется из корня репозитория
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
 
-class ContactPage(BasePage): #реализация паттерна
-    # Локаторы
-    FULL_NAME_INPUT = (By.ID, "full-name")
-    PHONE_INPUT = (By.ID, "phone")
-    ADDRESS_INPUT = (By.ID, "address")
-    AGREEMENT_CHECKBOX = (By.ID, "agreement-checkbox")
-    CHECKOUT_BUTTON = (By.ID, "checkout-btn")
-    # Локаторы для ошибок
-    FULL_NAME_ERROR = (By.ID, "full-name-error")
-    PHONE_ERROR = (By.ID, "phone-error")
-    ADDRESS_ERROR = (By.ID, "address-error")
-    AGREEMENT_ERROR = (By.ID, "agreement-error")
-    def __init__(self, driver): # Инициализирует self.driver и self.wait через родительский класс
-        super().__init__(driver)
-        self.driver = driver
-        #далее функции ввода данных
-    def fill_full_name(self, name):
-        self.send_keys(*self.FULL_NAME_INPUT, name)
-    def fill_phone_simple(self, phone):
-        """Ввод номера телефона"""
-        phone_field = self.find_element(*self.PHONE_INPUT)
-        phone_field.clear()
-        phone_field.send_keys(phone)
-    
-    def fill_address(self, address):
-        self.send_keys(*self.ADDRESS_INPUT, address)
-    
-    def check_agreement(self):
-        checkbox = self.find_element(*self.AGREEMENT_CHECKBOX)
-        if not checkbox.is_selected():
-            self.driver.execute_script("arguments[0].click();", checkbox)
-    
-    def submit_form(self):
-        self.click(*self.CHECKOUT_BUTTON)
-    
-    def get_form_data(self):
-        """Получаем текущие данные из формы для отладки"""
-        return {
-            'name': self.find_element(*self.FULL_NAME_INPUT).get_attribute('value'),
-            'phone': self.find_element(*self.PHONE_INPUT).get_attribute('value'),
-            'address': self.find_element(*self.ADDRESS_INPUT).get_attribute('value'),
-            'agreement': self.find_element(*self.AGREEMENT_CHECKBOX).is_selected()
-        }
+from pages import locators #локаторы страницы, проверенные по zakaz.html
+from pages.contacts_page import ContactPage #страница оформления заказа (с политикой повторов)
+from pages.result_store import artifact_path, attach #скриншоты попадают в хранилище результатов
 
 def debug_form_state(driver, page):
     """Функция для отладки состояния формы"""
@@ -74,18 +18,18 @@ def debug_form_state(driver, page):
     print(f"Данные формы: {form_data}")
     #проверка наличия данных в форме
     try:
-        cart_items = driver.find_elements(By.CLASS_NAME, "cart-item")
+        cart_items = driver.find_elements(*locators.CART_ITEM)
         print(f"Товаров в корзине: {len(cart_items)}")
         if len(cart_items) == 0:
             print("Ошибка: корзина пуста")
             # проверка отображения пустой корзины
-            empty_cart = driver.find_elements(By.CLASS_NAME, "empty-cart")
+            empty_cart = driver.find_elements(*locators.EMPTY_CART)
             if empty_cart:
                 print("✓ Отображается сообщение о пустой корзине")
     except Exception as e:
         print(f"Ошибка при проверке корзины: {e}")
     try:#проверка кнопки оформления заказа
-        checkout_btn = driver.find_element(By.ID, "checkout-btn")
+        checkout_btn = driver.find_element(*locators.CHECKOUT_BUTTON)
         print(f"Кнопка оформления: enabled={checkout_btn.is_enabled()}, displayed={checkout_btn.is_displayed()}")
     except Exception as e:
         print(f"Ошибка при проверке кнопки: {e}")
@@ -125,55 +69,28 @@ def test_successful_order_submission():
         debug_form_state(driver, contact_page)
         
         print("Отправка формы")
-        # Прокручиваем к кнопке и нажимаем
-        checkout_btn = driver.find_element(By.ID, "checkout-btn")
-        driver.execute_script("arguments[0].scrollIntoView({block: 'center'});", checkout_btn)
-        time.sleep(1)
-        
-        # Пробуем разные способы клика
-        print("Попытка 1")
-        checkout_btn.click()
-        # Ждем возможного alert
-        print("Ожидание сообщения")
-        time.sleep(5)
-        # Проверяем наличие alert
-        try:#работа с модальными окнами
-            alert = driver.switch_to.alert
-            alert_text = alert.text
-            print(f"Окно найдено! Текст: {alert_text}")
-            # Закрытие alert
-            alert.accept()
-            print("Окно закрыто")
-            # Проверяем содержание alert
-            if "Заказ оформлен" in alert_text: #при успешном оформлении
-                print("Тест пройден: заказ успешно оформлен")
-                return True
-            else:
-                print(f"Alert не содержит ожидаемый текст: {alert_text}")
-                return False
-        except Exception as e:
-            print(f"Alert не появился: {e}")
-            
-            # Пробуем альтернативный способ клика
-            print("Пробуем клик через JavaScript...")
-            driver.execute_script("arguments[0].click();", checkout_btn)
-            time.sleep(5)
-            try:
-                alert = driver.switch_to.alert
-                alert_text = alert.text
-                print(f"AСообщение найдено после JS клика! Текст: {alert_text}")
-                alert.accept()
-                return True
-            except:
-                print("Сообщение не появилось даже после JS клика")
-                # Сохранение скриншота об ошибке
-                driver.save_screenshot("no_alert_error.png")
-                print("Скриншот сохранен: no_alert_error.png")
-                return False
+        # Повторы (клик через JavaScript, если alert не появился) делает ContactPage
+        alert_text = contact_page.submit_and_get_alert_text(timeout=5)#работа с модальными окнами
+        print(f"Окно найдено и закрыто! Текст: {alert_text}")
+        # Проверяем содержание alert (при успешном оформлении)
+        assert "Заказ оформлен" in alert_text, f"Alert не содержит ожидаемый текст: {alert_text}"
+        print("Тест пройден: заказ успешно оформлен")
+    except NoAlertPresentException as e:
+        print(f"Сообщение не появилось даже после JS клика: {e}")
+        # Сохранение скриншота об ошибке
+        screenshot_path = artifact_path("no_alert_error.png")
+        driver.save_screenshot(screenshot_path)
+        attach(screenshot_path)
+        print(f"Скриншот сохранен: {screenshot_path}")
+        raise
+    except AssertionError:
+        raise
     except Exception as e:
         print(f"Критическая ошибка: {e}")
-        driver.save_screenshot("critical_error.png")
-        return False
+        screenshot_path = artifact_path("critical_error.png")
+        driver.save_screenshot(screenshot_path)
+        attach(screenshot_path)
+        raise
     finally:
         driver.quit() #выход из браузера
 
@@ -207,7 +124,7 @@ def test_form_validation():
     
         errors = []#проверка на ошибки
         try:
-            name_error = driver.find_element(By.ID, "full-name-error")
+            name_error = driver.find_element(*locators.FULL_NAME_ERROR)
             if name_error.is_displayed():
                 errors.append("name")
                 print(f"Ошибка имени: {name_error.text}")
@@ -215,7 +132,7 @@ def test_form_validation():
             pass
             
         try:
-            phone_error = driver.find_element(By.ID, "phone-error")
+            phone_error = driver.find_element(*locators.PHONE_ERROR)
             if phone_error.is_displayed():
                 errors.append("phone")
                 print(f"Ошибка телефона: {phone_error.text}")
@@ -223,7 +140,7 @@ def test_form_validation():
             pass
             
         try:
-            address_error = driver.find_element(By.ID, "address-error")
+            address_error = driver.find_element(*locators.ADDRESS_ERROR)
             if address_error.is_displayed():
                 errors.append("address")
                 print(f"Ошибка адреса: {address_error.text}")
@@ -233,19 +150,20 @@ def test_form_validation():
         print(f"Найдены ошибки: {errors}")
         
         # Проверяем, что есть ошибка имени
-        if "name" in errors:
-            print("Тест валидации пройден")
-            return True
-        else:
-            print("Ошибка имени не найдена")
-            return False
-            
-    except Exception as e:
-        print(f"Ошибка в тесте валидации: {e}")
-        return False
+        assert "name" in errors, "Ошибка имени не найдена"
+        print("Тест валидации пройден")
     finally:
         driver.quit()
 
+def run_scenario(test):
+    """Для запуска скриптом: True, если тест прошёл"""
+    try:
+        test()
+        return True
+    except Exception as e:
+        print(f"Тест не пройден: {e}")
+        return False
+
 def simple_smoke_test():
     """Тест 1"""
     driver = webdriver.Chrome()
@@ -262,16 +180,16 @@ def simple_smoke_test():
         
         # Проверяем основные элементы
         elements_to_check = [
-            ("full-name", "Поле имени"),
-            ("phone", "Поле телефона"),
-            ("address", "Поле адреса"),
-            ("checkout-btn", "Кнопка оформления"),
-            ("agreement-checkbox", "Чекбокс согласия")
+            (locators.FULL_NAME_INPUT, "Поле имени"),
+            (locators.PHONE_INPUT, "Поле телефона"),
+            (locators.ADDRESS_INPUT, "Поле адреса"),
+            (locators.CHECKOUT_BUTTON, "Кнопка оформления"),
+            (locators.AGREEMENT_CHECKBOX, "Чекбокс согласия")
         ]
         all_elements_found = True
-        for element_id, description in elements_to_check:
+        for locator, description in elements_to_check:
             try:
-                element = driver.find_element(By.ID, element_id)
+                element = driver.find_element(*locator)
                 print(f"{description} ЕСТЬ")
             except Exception as e:
                 print(f"{description} ОТСУТСТВУЕТ: {e}")
@@ -283,8 +201,8 @@ def simple_smoke_test():
         
         #Проверка наличия товаров в корзине
         try:
-            cart_items = driver.find_elements(By.CLASS_NAME, "cart-item")
-            empty_cart = driver.find_elements(By.CLASS_NAME, "empty-cart")
+            cart_items = driver.find_elements(*locators.CART_ITEM)
+            empty_cart = driver.find_elements(*locators.EMPTY_CART)
             
             if cart_items:
                 print(f"В корзине товаров: {len(cart_items)}")
@@ -318,11 +236,11 @@ if __name__ == "__main__":
     
     if smoke_result:
         print("\nТест №2")
-        order_result = test_successful_order_submission()
+        order_result = run_scenario(test_successful_order_submission)
         results.append(("Оформление заказа", order_result))
         
         print("\nТест №3")
-        validation_result = test_form_validation()
+        validation_result = run_scenario(test_form_validation)
         results.append(("Валидация формы", validation_result))
     else:
         print("\nПервый тест не пройден, тестирование закончено")#недопуск до следующих тестов
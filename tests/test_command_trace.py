@@ -0,0 +1,112 @@
+import pytest
+
+from pages.command_trace import analyze_trace, load_trace, record_commands
+
+
+def lookup(ts, value, dur=0.01, err=None, test="t::a"):
+    record = {"ts": ts, "dur": dur, "cmd": "findElement", "using": "id", "value": value, "test": test}
+    if err:
+        record["err"] = err
+    return record
+
+
+def command(ts, cmd, dur=0.01, test="t::a"):
+    return {"ts": ts, "dur": dur, "cmd": cmd, "test": test}
+
+
+def test_redundant_lookups_reset_after_navigation():
+    report = analyze_trace([
+        command(0.0, "get", dur=0.5),
+        lookup(0.5, "phone"),
+        lookup(0.51, "phone"),
+        command(0.52, "refresh"),
+        lookup(0.53, "phone"),
+    ])["t::a"]
+    assert report["commands"] == 5
+    assert report["redundant_lookups"] == [(("id", "phone"), 1)]
+
+
+def test_failed_polls_are_not_redundant():
+    report = analyze_trace([
+        lookup(0.0, "checkout-btn", err="NoSuchElementException"),
+        lookup(0.1, "checkout-btn", err="NoSuchElementException"),
+        lookup(0.2, "checkout-btn"),
+    ])["t::a"]
+    assert report["failed_polls"] == [(("id", "checkout-btn"), 2)]
+    assert report["redundant_lookups"] == []
+
+
+def test_gaps_and_idle_time():
+    report = analyze_trace([
+        command(0.0, "get", dur=1.0),
+        command(3.0, "findElement", dur=0.5),
+        command(3.6, "executeScript", dur=0.4),
+    ], gap_threshold=0.2)["t::a"]
+    assert report["span_sec"] == 4.0
+    assert report["busy_sec"] == 1.9
+    assert report["idle_sec"] == 2.1
+    assert report["gaps"] == [{"after": "get", "before": "findElement", "sec": 2.0}]
+    assert report["time_by_command"][0] == ("get", 1.0)
+    assert report["time_by_command"][-1] == ("<простой>", 2.1)
+
+
+def test_records_are_grouped_by_test_and_sorted():
+    report = analyze_trace([
+        command(1.0, "click", test="t::b"),
+        command(0.0, "get", test="t::b"),
+        command(0.0, "get", test=""),
+    ])
+    assert set(report) == {"t::b", "<вне теста>"}
+    assert report["t::b"]["span_sec"] == 1.01
+
+
+class FakeDriver:
+    """execute возвращает ответ или поднимает исключение из responses"""
+
+    def __init__(self, responses):
+        self.responses = responses
+        self.calls = []
+
+    def execute(self, driver_command, params=None):
+        self.calls.append(driver_command)
+        response = self.responses.get(driver_command, {"value": None})
+        if isinstance(response, Exception):
+            raise response
+        return response
+
+
+def test_recorder_writes_commands(tmp_path, monkeypatch):
+    monkeypatch.setenv("PYTEST_CURRENT_TEST", "t::a (call)")
+    driver = FakeDriver({"findElement": {"value": {"element-6066": "abc"}}, "click": ValueError("boom")})
+    path = str(tmp_path / "trace.ndjson")
+    record_commands(driver, path)
+
+    assert driver.execute("findElement", {"using": "id", "value": "phone"}) == {"value": {"element-6066": "abc"}}
+    with pytest.raises(ValueError):
+        driver.execute("click", {"id": "abc"})
+    driver.execute("quit")
+    # После quit обёртка снята: команда выполняется, но не пишется
+    driver.execute("getTitle")
+
+    records = list(load_trace(path))
+    assert [r["cmd"] for r in records] == ["findElement", "click", "quit"]
+    assert driver.calls == ["findElement", "click", "quit", "getTitle"]
+    lookup, click, _ = records
+    assert (lookup["using"], lookup["value"], lookup["test"]) == ("id", "phone", "t::a")
+    assert lookup["resp"] > 0 and lookup["req"] > 0
+    assert "err" not in lookup
+    assert click["err"] == "ValueError"
+    assert "using" not in click
+
+
+def test_stop_restores_execute(tmp_path):
+    driver = FakeDriver({})
+    original = driver.execute
+    recorder = record_commands(driver, str(tmp_path / "trace.ndjson"))
+    assert driver.execute != original
+    recorder.stop()
+    assert driver.execute == original
+    # Запись после остановки (например, из другого потока) игнорируется
+    recorder._traced_execute("getTitle")
+    recorder.stop()
+    assert list(load_trace(str(tmp_path / "trace.ndjson"))) == []
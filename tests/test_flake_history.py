@@ -0,0 +1,54 @@
+from unittest import mock
+
+from pages.flake_history import FlakeHistory
+
+
+def history(runs):
+    """История в памяти; runs - (nodeid, outcome, duration, retries) от старых к новым"""
+    h = FlakeHistory(":memory:")
+    with mock.patch("pages.flake_history.time.time", side_effect=range(1, len(runs) + 1)):
+        for run in runs:
+            h.record(*run)
+    return h
+
+
+def test_consistent_failure_is_not_flaky():
+    stats = history([("t::a", "failed", 1.0, 0)] * 5).stats()["t::a"]
+    assert stats["failures"] == 5
+    assert stats["flake_rate"] == 0.0
+    assert not stats["flaky"]
+
+
+def test_outcome_changes_and_retried_passes_are_flaky():
+    stats = history([
+        ("t::flip", "passed", 1.0, 0),
+        ("t::flip", "failed", 3.0, 0),
+        ("t::flip", "passed", 2.0, 0),
+        ("t::retry", "passed", 1.0, 2),
+        ("t::retry", "passed", 1.0, 0),
+        ("t::retry", "failed", 1.0, 1),
+    ]).stats()
+    assert stats["t::flip"]["changes"] == 2
+    assert stats["t::flip"]["mean_duration"] == 2.0
+    assert stats["t::flip"]["flaky"]
+    # Повторы в упавшем прогоне не считаются, смена результата - считается
+    assert stats["t::retry"]["retried"] == 1
+    assert stats["t::retry"]["changes"] == 1
+    assert stats["t::retry"]["flake_rate"] == round(2 / 3, 3)
+
+
+def test_stats_use_last_runs_only():
+    runs = [("t::a", "passed", 1.0, 0), ("t::a", "failed", 1.0, 0)] + [("t::a", "passed", 5.0, 0)] * 3
+    stats = history(runs).stats(last=3)["t::a"]
+    assert stats["runs"] == 3
+    assert stats["mean_duration"] == 5.0
+    assert stats["changes"] == 0
+
+
+def test_order_flaky_then_slow_then_new():
+    h = history([
+        ("t::fast", "passed", 1.0, 0),
+        ("t::slow", "passed", 9.0, 0),
+        ("t::flaky", "passed", 2.0, 1),
+    ])
+    assert h.order(["t::new", "t::fast", "t::slow", "t::flaky"]) == ["t::flaky", "t::slow", "t::fast", "t::new"]
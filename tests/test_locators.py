@@ -0,0 +1,81 @@
+import pytest
+from selenium.webdriver.common.by import By
+
+from pages.locators import LocatorRegistry, UnknownLocatorError
+
+
+PAGE = """<html><body>
+<input id="full-name" class="form-input">
+<div id="cart"></div>
+<script>
+  cart.innerHTML = `<div class="cart-item" id="item-1"></div>`;
+  empty.className = 'empty-cart';
+</script>
+</body></html>"""
+
+
+class FakeDriver:
+    def __init__(self, present, url="file:///tmp/page.html", ready=True):
+        self.present = present
+        self.current_url = url
+        self.ready = ready
+
+    def execute_script(self, script, ids):
+        if not self.ready:
+            return None
+        return [i for i in ids if i in self.present]
+
+
+@pytest.fixture
+def registry(tmp_path):
+    path = tmp_path / "page.html"
+    path.write_text(PAGE, encoding="utf-8")
+    return LocatorRegistry(str(path))
+
+
+def test_check_ids_and_classes(registry):
+    registry.check(By.ID, "full-name")
+    registry.check(By.ID, "item-1")
+    registry.check(By.CLASS_NAME, "form-input")
+    registry.check(By.CLASS_NAME, "cart-item")
+    registry.check(By.CLASS_NAME, "empty-cart")
+    # Прочие стратегии не проверяются
+    registry.check(By.CSS_SELECTOR, "#missing")
+    with pytest.raises(UnknownLocatorError):
+        registry.check(By.ID, "full_name")
+    with pytest.raises(UnknownLocatorError):
+        registry.check(By.CLASS_NAME, "cart-items")
+
+
+def test_register_fails_on_typo(registry):
+    assert registry.register("NAME", By.ID, "full-name") == (By.ID, "full-name")
+    with pytest.raises(UnknownLocatorError):
+        registry.register("PHONE", By.ID, "phone")
+    assert list(registry.locators) == ["NAME"]
+
+
+def test_element_index(registry):
+    assert registry.element("full-name") == ("input", {"id": "full-name", "class": "form-input"})
+    with pytest.raises(UnknownLocatorError):
+        registry.element("phone")
+
+
+def test_validate_live_marks_missing_per_driver(registry):
+    registry.register("NAME", By.ID, "full-name")
+    registry.register("CART", By.ID, "cart")
+    driver = FakeDriver({"full-name"})
+    assert registry.validate_live(driver) == ["CART"]
+    assert registry.live_checked(driver)
+    with pytest.raises(UnknownLocatorError):
+        registry.check(By.ID, "cart", driver)
+    # Для других драйверов результат не действует
+    registry.check(By.ID, "cart")
+    registry.check(By.ID, "cart", FakeDriver(set()))
+
+
+def test_validate_live_skips_other_or_loading_page(registry):
+    registry.register("NAME", By.ID, "full-name")
+    for driver in (FakeDriver(set(), url="about:blank"), FakeDriver(set(), ready=False)):
+        assert registry.validate_live(driver) is None
+        assert not registry.live_checked(driver)
+        registry.check(By.ID, "full-name", driver)
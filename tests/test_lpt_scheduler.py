@@ -0,0 +1,36 @@
+from pages.lpt_scheduler import DEFAULT_DURATION, estimate, plan, predict_makespan, predict_total
+
+
+def stat(duration, flaky=False):
+    return {"mean_duration": duration, "flaky": flaky}
+
+
+def test_estimate_uses_median_for_unknown_tests():
+    stats = {"a": stat(10.0), "b": stat(2.0), "c": stat(4.0)}
+    durations = estimate(["a", "b", "new"], stats)
+    assert durations == {"a": 10.0, "b": 2.0, "new": 4.0}
+
+
+def test_estimate_without_history():
+    assert estimate(["a"], {}) == {"a": DEFAULT_DURATION}
+
+
+def test_plan_isolates_flaky_tests_longest_first():
+    stats = {"a": stat(1.0), "b": stat(5.0, flaky=True), "c": stat(3.0), "d": stat(7.0, flaky=True)}
+    durations = estimate(list(stats), stats)
+    isolated, parallel = plan(["a", "b", "c", "d", "new"], dict(durations, new=2.0), stats)
+    assert isolated == ["d", "b"]
+    assert parallel == ["c", "new", "a"]
+
+
+def test_predict_makespan_assigns_to_least_loaded_worker():
+    durations = {"a": 7.0, "b": 5.0, "c": 4.0, "d": 3.0}
+    # a | b + c -> воркеры 7 и 9, d уходит к первому: 10 и 9
+    assert predict_makespan(["a", "b", "c", "d"], durations, workers=2, overhead=0.0) == 10.0
+    assert predict_makespan(["a", "b"], durations, workers=2, overhead=1.0) == 8.0
+    assert predict_makespan([], durations, workers=2) == 0.0
+
+
+def test_predict_total_adds_serial_phase():
+    durations = {"flaky": 6.0, "a": 4.0, "b": 4.0}
+    assert predict_total(["flaky"], ["a", "b"], durations, workers=2, overhead=1.0) == 12.0
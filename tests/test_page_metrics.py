@@ -0,0 +1,49 @@
+from pages.page_metrics import summarize
+
+
+def sample(get_sec=1.0, navigation=None, lcp=None, images=(), long_tasks=()):
+    return {"get_sec": get_sec, "navigation": navigation, "paint": {}, "lcp": lcp,
+            "long_tasks": list(long_tasks), "images": list(images)}
+
+
+def test_summarize_aggregates_samples():
+    summary = summarize([
+        sample(get_sec=1.0, navigation={"dom_content_loaded": 100, "dom_content_loaded_handlers": 5, "load": 200},
+               lcp=150, long_tasks=[{"start": 0, "duration": 60}],
+               images=[{"decode": 4.0}, {"decode": 6.0}]),
+        sample(get_sec=3.0, navigation={"dom_content_loaded": 300, "dom_content_loaded_handlers": 7, "load": 400},
+               lcp=250, long_tasks=[{"start": 0, "duration": 70.5}, {"start": 90, "duration": 50}],
+               images=[{"decode": 2.0}]),
+    ])
+    assert summary["loads"] == 2
+    assert summary["get_sec"] == {"min": 1.0, "max": 3.0, "mean": 2.0}
+    assert summary["load_ms"] == {"min": 200, "max": 400, "mean": 300.0}
+    assert summary["largest_contentful_paint_ms"]["mean"] == 200.0
+    assert summary["long_tasks"] == 3
+    assert summary["long_tasks_ms"] == 180.5
+    assert summary["images"] == 2
+    assert summary["image_decode_total_ms"] == {"min": 2.0, "max": 10.0, "mean": 6.0}
+    assert summary["image_decode_errors"] == 0
+
+
+def test_summarize_skips_missing_entries():
+    summary = summarize([
+        # Нет Navigation Timing, LCP и картинок
+        sample(),
+        # Картинка не декодировалась: это не 0 мс
+        sample(navigation={"dom_content_loaded": 100, "dom_content_loaded_handlers": 5, "load": 200},
+               images=[{"decode": None, "error": True}]),
+    ])
+    assert summary["load_ms"] == {"min": 200, "max": 200, "mean": 200.0}
+    assert summary["largest_contentful_paint_ms"] is None
+    assert summary["first_contentful_paint_ms"] is None
+    assert summary["image_decode_total_ms"] is None
+    assert summary["image_decode_errors"] == 1
+    assert summary["long_tasks"] == 0
+
+
+def test_summarize_without_samples():
+    summary = summarize([])
+    assert summary["loads"] == 0
+    assert summary["get_sec"] is None
+    assert summary["images"] == 0
@@ -0,0 +1,58 @@
+import json
+import os
+import sqlite3
+from types import SimpleNamespace
+
+from pages import result_store
+from pages.result_report import build_report, page_name
+from pages.result_store import ResultStore
+
+
+def report(nodeid, when="call", outcome="passed", longrepr=None, **extra):
+    return SimpleNamespace(nodeid=nodeid, when=when, outcome=outcome, duration=0.5,
+                           failed=outcome == "failed", longrepr=longrepr, **extra)
+
+
+def test_store_writes_artifacts_and_metrics(tmp_path, monkeypatch):
+    monkeypatch.setitem(result_store._artifacts, "t::a", [str(tmp_path / "shot.png")])
+    store = ResultStore(str(tmp_path / "results.sqlite"), "run")
+    store.add(report("t::a", outcome="failed", longrepr="x" * (result_store.MAX_LONGREPR * 2),
+                     page_metrics={"long_tasks": 2}))
+    store.add(report("t::b"))
+    store.close()
+
+    conn = sqlite3.connect(str(tmp_path / "results.sqlite"))
+    rows = conn.execute("SELECT nodeid, longrepr, artifacts, metrics FROM results ORDER BY id").fetchall()
+    conn.close()
+    (_, longrepr, artifacts, metrics), second = rows
+    assert len(longrepr) < result_store.MAX_LONGREPR + 10
+    assert json.loads(artifacts) == [str(tmp_path / "shot.png")]
+    assert json.loads(metrics) == {"long_tasks": 2}
+    assert second == ("t::b", None, None, None)
+    assert "t::a" not in result_store._artifacts
+
+
+def test_report_is_split_into_pages(tmp_path):
+    db = str(tmp_path / "results.sqlite")
+    store = ResultStore(db, "run")
+    for i in range(5):
+        store.add(report(f"t::{i}", when="setup"))
+        store.add(report(f"t::{i}", page_metrics={"long_tasks": i} if i % 2 else None))
+    store.close()
+
+    out = tmp_path / "out"
+    assert build_report(db, str(out), page_size=2) == 3
+    assert sorted(os.listdir(out)) == sorted(
+        [page_name(1), page_name(2), page_name(3), "index.html", "page_metrics.json"])
+    last = (out / page_name(3)).read_text(encoding="utf-8")
+    assert "t::4" in last and "вперёд" not in last
+    assert "вперёд" in (out / page_name(1)).read_text(encoding="utf-8")
+    metrics = json.loads((out / "page_metrics.json").read_text(encoding="utf-8"))
+    assert metrics == {"t::1": {"long_tasks": 1}, "t::3": {"long_tasks": 3}}
+
+
+def test_report_for_empty_store(tmp_path):
+    db = str(tmp_path / "results.sqlite")
+    ResultStore(db).close()
+    assert build_report(db, str(tmp_path / "out")) == 0
+    assert os.path.exists(tmp_path / "out" / "index.html")
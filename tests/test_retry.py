@@ -0,0 +1,73 @@
+import pytest
+from selenium.common.exceptions import (
+    ElementClickInterceptedException,
+    NoAlertPresentException,
+    StaleElementReferenceException,
+    TimeoutException,
+)
+
+from pages import retry
+from pages.command_trace import current_test_name
+from pages.retry import RetryPolicy, classify
+
+
+def failing(*errors, result="ok"):
+    """Действие, которое по очереди поднимает errors, затем возвращает result"""
+    errors = list(errors)
+    calls = []
+
+    def action(kind=None):
+        calls.append(kind)
+        if errors:
+            raise errors.pop(0)
+        return result
+
+    return action, calls
+
+
+def test_classify():
+    assert classify(StaleElementReferenceException()) == "stale"
+    assert classify(ElementClickInterceptedException()) == "intercepted"
+    assert classify(NoAlertPresentException()) == "no_alert"
+    assert classify(TimeoutException()) == "timeout"
+    assert classify(ValueError()) is None
+
+
+def test_retries_and_records_stats():
+    action, calls = failing(StaleElementReferenceException(), StaleElementReferenceException())
+    assert RetryPolicy(delay=0).run(action) == "ok"
+    assert len(calls) == 3
+    assert retry.stats.pop(current_test_name()) == {"stale": 2}
+
+
+def test_gives_up_after_attempts():
+    action, calls = failing(*[StaleElementReferenceException()] * 5)
+    with pytest.raises(StaleElementReferenceException):
+        RetryPolicy(attempts={"stale": 2}, delay=0).run(action)
+    assert len(calls) == 2
+    retry.stats.pop(current_test_name(), None)
+
+
+def test_unclassified_and_timeout_are_not_retried():
+    for error in (ValueError(), TimeoutException()):
+        action, calls = failing(error)
+        with pytest.raises(type(error)):
+            RetryPolicy(delay=0).run(action)
+        assert len(calls) == 1
+
+
+def test_fallback_gets_failure_kind():
+    action, calls = failing(ElementClickInterceptedException())
+    fallback, fallback_calls = failing(result="js")
+    assert RetryPolicy(delay=0).run(action, fallback) == "js"
+    assert fallback_calls == ["intercepted"]
+    retry.stats.pop(current_test_name(), None)
+
+
+def test_attempts_are_counted_per_kind():
+    # stale на первой попытке не отнимает попытку у no_alert
+    action, _ = failing(StaleElementReferenceException())
+    fallback, fallback_calls = failing(NoAlertPresentException(), result="alert")
+    assert RetryPolicy(delay=0).run(action, fallback) == "alert"
+    assert fallback_calls == ["stale", "no_alert"]
+    assert retry.stats.pop(current_test_name()) == {"stale": 1, "no_alert": 1}
@@ -1,75 +1,31 @@
 from selenium import webdriver
-from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.chrome.service import Service
 from selenium.webdriver.chrome.options import Options
+from selenium.common.exceptions import NoAlertPresentException
+from selenium.webdriver.common.by import By
+import json
 import os
+import statistics
+import sys
+import threading
 import time
 
-class BasePage:
-    def __init__(self, driver):
-        self.driver = driver
-        self.wait = WebDriverWait(driver, 10)
-    
-    def find_element(self, by, value):
-        return self.wait.until(EC.presence_of_element_located((by, value)))
-    
-    def find_clickable_element(self, by, value):
-        return self.wait.until(EC.element_to_be_clickable((by, value)))
-    
-    def click(self, by, value):
-        element = self.find_clickable_element(by, value)
-        element.click()
-    
-    def send_keys(self, by, value, text):
-        element = self.find_element(by, value)
-        element.clear()
-        element.send_keys(text)
+# При запуске как скрипта (python tests/test_zakaz.py) пакет pages лежит в корне репозитория
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
 
-class ContactPage(BasePage):
-    # Локаторы
-    FULL_NAME_INPUT = (By.ID, "full-name")
-    PHONE_INPUT = (By.ID, "phone")
-    ADDRESS_INPUT = (By.ID, "address")
-    AGREEMENT_CHECKBOX = (By.ID, "agreement-checkbox")
-    CHECKOUT_BUTTON = (By.ID, "checkout-btn")
-    
-    def __init__(self, driver):
-        super().__init__(driver)
-        self.driver = driver
-    
-    def fill_full_name(self, name):
-        self.send_keys(*self.FULL_NAME_INPUT, name)
-    
-    def fill_phone_simple(self, phone):
-        """Ввод номера телефона"""
-        phone_field = self.find_element(*self.PHONE_INPUT)
-        phone_field.clear()
-        phone_field.send_keys(phone)
-    
-    def fill_address(self, address):
-        self.send_keys(*self.ADDRESS_INPUT, address)
-    
-    def check_agreement(self):
-        checkbox = self.find_element(*self.AGREEMENT_CHECKBOX)
-        if not checkbox.is_selected():
-            checkbox.click()
-    
-    def submit_form(self):
-        self.click(*self.CHECKOUT_BUTTON)
-    
-    def get_form_data(self):
-        """Получаем текущие данные из формы для отладки"""
-        return {
-            'name': self.find_element(*self.FULL_NAME_INPUT).get_attribute('value'),
-            'phone': self.find_element(*self.PHONE_INPUT).get_attribute('value'),
-            'address': self.find_element(*self.ADDRESS_INPUT).get_attribute('value'),
-            'agreement': self.find_element(*self.AGREEMENT_CHECKBOX).is_selected()
-        }
+from pages import locators
+from pages.command_trace import record_commands
+from pages.base_page import FILL_STRATEGIES
+from pages.contacts_page import ContactPage
+from pages.page_metrics import collect_metrics_on_get
+from pages.tab_pool import TabMultiplexer
+from pages.result_store import artifact_path, attach
 
-def setup_driver(headless=True):
-    """Настройка драйвера для CI (без webdriver-manager)"""
+def setup_driver(headless=True, page_metrics=None):
+    """Настройка драйвера для CI (без webdriver-manager).
+    
+    page_metrics=None - по переменной UI_PAGE_METRICS (по умолчанию включено)
+    """
     chrome_options = Options()
     
     if headless:
@@ -101,6 +57,17 @@ def setup_driver(headless=True):
     if not headless:
         driver.maximize_window()
     
+    # Запись трассы команд: UI_TRACE=trace.ndjson
+    trace_path = os.environ.get('UI_TRACE')
+    if trace_path:
+        record_commands(driver, trace_path)
+    
+    # Метрики загрузки страницы после каждого driver.get (UI_PAGE_METRICS=0 - выключить)
+    if page_metrics is None:
+        page_metrics = os.environ.get('UI_PAGE_METRICS', '1') != '0'
+    if page_metrics:
+        collect_metrics_on_get(driver)
+    
     return driver
 
 def debug_form_state(driver, page):
@@ -114,7 +81,7 @@ def debug_form_state(driver, page):
     
     # Проверка наличия данных в форме
     try:
-        cart_items = driver.find_elements(By.CLASS_NAME, "cart-item")
+        cart_items = driver.find_elements(*locators.CART_ITEM)
         print(f"Товаров в корзине: {len(cart_items)}")
         if len(cart_items) == 0:
             print("Внимание: корзина пуста")
@@ -122,7 +89,7 @@ def debug_form_state(driver, page):
         print(f"Ошибка при проверке корзины: {e}")
     
     try:
-        checkout_btn = driver.find_element(By.ID, "checkout-btn")
+        checkout_btn = driver.find_element(*locators.CHECKOUT_BUTTON)
         print(f"Кнопка оформления: enabled={checkout_btn.is_enabled()}")
     except Exception as e:
         print(f"Ошибка при проверке кнопки: {e}")
@@ -178,45 +145,34 @@ def test_successful_order_submission():
         
         print("Отправка формы...")
         
-        # Прокручиваем к кнопке оформления
-        checkout_btn = driver.find_element(By.ID, "checkout-btn")
-        driver.execute_script("arguments[0].scrollIntoView({block: 'center'});", checkout_btn)
-        time.sleep(0.5)
+        # Нажимаем кнопку и ждем alert; если он не появился,
+        # ContactPage повторяет только клик (через JavaScript)
+        alert_text = contact_page.submit_and_get_alert_text(timeout=5)
+        print(f"Alert найден и закрыт! Текст: {alert_text}")
         
-        # Нажимаем кнопку
-        checkout_btn.click()
-        time.sleep(3)  # Ждем обработки
+        # Проверяем содержание alert
+        assert "Заказ оформлен" in alert_text, f"Alert не содержит ожидаемый текст: {alert_text}"
+        print("✓ ТЕСТ ПРОЙДЕН: заказ успешно оформлен")
+        
+    except NoAlertPresentException as e:
+        print(f"✗ Alert не появился: {e}")
+        
+        # Делаем скриншот для отладки
+        screenshot_path = artifact_path("test_failure.png")
+        driver.save_screenshot(screenshot_path)
+        attach(screenshot_path)
+        print(f"Скриншот сохранен: {screenshot_path}")
+        raise
+        
+    except AssertionError:
+        raise
         
-        # Проверяем наличие alert
-        try:
-            alert = driver.switch_to.alert
-            alert_text = alert.text
-            print(f"Alert найден! Текст: {alert_text}")
-            
-            # Проверяем содержание alert
-            if "Заказ оформлен" in alert_text:
-                print("✓ ТЕСТ ПРОЙДЕН: заказ успешно оформлен")
-                alert.accept()
-                return True
-            else:
-                print(f"✗ Alert не содержит ожидаемый текст: {alert_text}")
-                alert.accept()
-                return False
-                
-        except Exception as e:
-            print(f"✗ Alert не появился: {e}")
-            
-            # Делаем скриншот для отладки
-            screenshot_path = "test_failure.png"
-            driver.save_screenshot(screenshot_path)
-            print(f"Скриншот сохранен: {screenshot_path}")
-            
-            return False
-            
     except Exception as e:
         print(f"✗ Критическая ошибка: {e}")
-        driver.save_screenshot("critical_error.png")
-        return False
+        screenshot_path = artifact_path("critical_error.png")
+        driver.save_screenshot(screenshot_path)
+        attach(screenshot_path)
+        raise
         
     finally:
         driver.quit()
@@ -266,7 +222,7 @@ def test_form_validation():
         errors_found = []
         
         try:
-            name_error = driver.find_element(By.ID, "full-name-error")
+            name_error = driver.find_element(*locators.FULL_NAME_ERROR)
             if name_error.is_displayed():
                 errors_found.append("name")
                 print(f"✓ Ошибка имени отображается: {name_error.text}")
@@ -277,7 +233,7 @@ def test_form_validation():
         
         # Проверяем, что нет других ошибок
         try:
-            phone_error = driver.find_element(By.ID, "phone-error")
+            phone_error = driver.find_element(*locators.PHONE_ERROR)
             if phone_error.is_displayed():
                 errors_found.append("phone")
                 print(f"✗ Неожиданная ошибка телефона: {phone_error.text}")
@@ -285,7 +241,7 @@ def test_form_validation():
             pass  # Ошибка телефона не должна отображаться
         
         try:
-            address_error = driver.find_element(By.ID, "address-error")
+            address_error = driver.find_element(*locators.ADDRESS_ERROR)
             if address_error.is_displayed():
                 errors_found.append("address")
                 print(f"✗ Неожиданная ошибка адреса: {address_error.text}")
@@ -295,22 +251,188 @@ def test_form_validation():
         print(f"Найдены ошибки: {errors_found}")
         
         # Тест пройден, если есть только ошибка имени
-        if errors_found == ["name"]:
-            print("✓ ТЕСТ ПРОЙДЕН: валидация работает корректно")
-            return True
-        else:
-            print(f"✗ ТЕСТ НЕ ПРОЙДЕН: ожидалась только ошибка имени, а найдены: {errors_found}")
-            return False
+        assert errors_found == ["name"], f"Ожидалась только ошибка имени, а найдены: {errors_found}"
+        print("✓ ТЕСТ ПРОЙДЕН: валидация работает корректно")
+        
+    finally:
+        driver.quit()
+        print("Драйвер закрыт")
+        print("="*60 + "\n")
+
+def test_tab_multiplexing():
+    """Несколько сценариев во вкладках одного браузера"""
+    print("="*60)
+    print("ТЕСТ: Несколько вкладок в одном браузере")
+    print("="*60)
+    
+    is_ci = os.environ.get('CI') == 'true'
+    driver = setup_driver(headless=is_ci)
+    tabs = int(os.environ.get('UI_TABS', '3'))
+    mux = TabMultiplexer(driver, tabs, page_class=ContactPage)
+    
+    current_dir = os.path.dirname(os.path.abspath(__file__))
+    file_path = f"file://{os.path.join(current_dir, '../test_data/zakaz.html')}"
+    results = {}
+    errors = {}
+    # Все вкладки отправляют форму одновременно
+    ready = threading.Barrier(tabs)
+    
+    def scenario(index):
+        try:
+            with mux.session(index) as page:
+                page.driver.get(file_path)
+                page.driver.execute_script("localStorage.setItem('tab', arguments[0]);", str(index))
+                page.fill_full_name(f"Покупатель {index}")
+                page.fill_phone_simple("89041234567")
+                page.fill_address(f"г. Москва, д. {index}")
+                page.check_agreement()
+                ready.wait(timeout=60)
+                alert_text = page.submit_and_get_alert_text()
+                storage = page.driver.execute_script("return Object.assign({}, localStorage);")
+                results[index] = {'alert': alert_text, 'storage': storage}
+        except Exception as e:
+            errors[index] = e
+            ready.abort()
+    
+    try:
+        workers = [threading.Thread(target=scenario, args=(i,)) for i in range(tabs)]
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join()
+        
+        assert not errors, f"Ошибки в вкладках: {errors}"
+        for index in range(tabs):
+            print(f"Вкладка {index}: {results[index]}")
+            # Каждая вкладка получила свой alert...
+            assert f"Имя: Покупатель {index}" in results[index]['alert']
+            assert f"Адрес: г. Москва, д. {index}" in results[index]['alert']
+            # ...и видит только свой localStorage
+            assert results[index]['storage'] == {'tab': str(index)}
+        print("✓ ТЕСТ ПРОЙДЕН: вкладки изолированы")
+        
+    finally:
+        mux.close()
+        driver.quit()
+        print("Драйвер закрыт")
+        print("="*60 + "\n")
+
+def test_tab_storage_at_page_load():
+    """Скрипты страницы при загрузке видят localStorage своей вкладки"""
+    print("="*60)
+    print("ТЕСТ: localStorage вкладок при загрузке страницы")
+    print("="*60)
+    
+    is_ci = os.environ.get('CI') == 'true'
+    driver = setup_driver(headless=is_ci)
+    tabs = int(os.environ.get('UI_TABS', '3'))
+    mux = TabMultiplexer(driver, tabs, page_class=ContactPage)
+    
+    current_dir = os.path.dirname(os.path.abspath(__file__))
+    probe_path = f"file://{os.path.join(current_dir, '../test_data/storage_probe.html')}"
+    results = {}
+    errors = {}
+    # Вторая загрузка - после того, как все вкладки записали свои данные
+    written = threading.Barrier(tabs)
+    
+    def storage_at_load(page):
+        page.driver.get(probe_path)
+        return json.loads(page.driver.find_element(By.ID, 'storage-at-load').text)
+    
+    def scenario(index):
+        try:
+            with mux.session(index) as page:
+                # Первая загрузка с about:blank: данных других вкладок не видно
+                first = storage_at_load(page)
+                page.driver.execute_script("localStorage.setItem('tab', arguments[0]);", str(index))
+                written.wait(timeout=60)
+                results[index] = (first, storage_at_load(page))
+        except Exception as e:
+            errors[index] = e
+            written.abort()
+    
+    try:
+        workers = [threading.Thread(target=scenario, args=(i,)) for i in range(tabs)]
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join()
+        
+        assert not errors, f"Ошибки в вкладках: {errors}"
+        for index in range(tabs):
+            print(f"Вкладка {index}: {results[index]}")
+            assert results[index] == ({}, {'tab': str(index)})
+        print("✓ ТЕСТ ПРОЙДЕН: страница видит localStorage своей вкладки")
+        
+    finally:
+        mux.close()
+        driver.quit()
+        print("Драйвер закрыт")
+        print("="*60 + "\n")
+
+def test_fill_strategy_benchmark():
+    """Время ввода одного поля для каждой стратегии заполнения"""
+    print("="*60)
+    print("ТЕСТ: Сравнение стратегий ввода")
+    print("="*60)
+    
+    is_ci = os.environ.get('CI') == 'true'
+    # Замер ввода не должен делить браузер со скриптом метрик страницы
+    driver = setup_driver(headless=is_ci, page_metrics=False)
+    repeats = int(os.environ.get('UI_FILL_REPEATS', '5'))
+    long_address = "г. Москва, ул. Примерная, д. 1, кв. 1, подъезд 2, этаж 3, домофон 15, " * 3
+    fields = [
+        ("name", locators.FULL_NAME_INPUT, "Иван Иванов"),
+        ("phone", locators.PHONE_INPUT, "89041234567"),
+        ("address", locators.ADDRESS_INPUT, long_address),
+    ]
+    results = {}
+    
+    try:
+        current_dir = os.path.dirname(os.path.abspath(__file__))
+        file_path = f"file://{os.path.join(current_dir, '../test_data/zakaz.html')}"
+        driver.get(file_path)
+        
+        for strategy in FILL_STRATEGIES:
+            page = ContactPage(driver, fill_strategy=strategy)
+            results[strategy] = {}
+            for name, locator, text in fields:
+                timings = []
+                for _ in range(repeats):
+                    started = time.perf_counter()
+                    page.send_keys(*locator, text)
+                    timings.append((time.perf_counter() - started) * 1000)
+                results[strategy][name] = {
+                    "median_ms": round(statistics.median(timings), 2),
+                    "max_ms": round(max(timings), 2),
+                }
             
-    except Exception as e:
-        print(f"✗ Ошибка в тесте валидации: {e}")
-        return False
+            # Маска телефона должна отработать одинаково при любой стратегии
+            form_data = page.get_form_data()
+            print(f"{strategy}: {results[strategy]}, данные формы: {form_data}")
+            assert form_data['phone'] == "+7 (904) 123-45-67"
+            assert form_data['address'] == long_address
+        
+        benchmark_path = os.environ.get('UI_FILL_BENCHMARK_JSON') or artifact_path('fill_benchmark.json')
+        with open(benchmark_path, "w", encoding="utf-8") as f:
+            json.dump(results, f, ensure_ascii=False, indent=2)
+        attach(benchmark_path)
+        print(f"Результаты сохранены: {benchmark_path}")
         
     finally:
         driver.quit()
         print("Драйвер закрыт")
         print("="*60 + "\n")
 
+def run_scenario(test):
+    """Для запуска скриптом: результат теста как True/False"""
+    try:
+        test()
+        return True
+    except Exception as e:
+        print(f"✗ ТЕСТ НЕ ПРОЙДЕН: {type(e).__name__}: {e}")
+        return False
+
 def simple_smoke_test():
     """Простой smoke-тест: проверка доступности страницы и элементов"""
     print("="*60)
@@ -331,20 +453,27 @@ def simple_smoke_test():
         
         print("Проверка основных элементов...")
         
+        # Разовая проверка всех зарегистрированных локаторов по живому DOM
+        missing = locators.zakaz.validate_live(driver)
+        if missing is None:
+            print("✗ Страница заказа не открыта или не загрузилась")
+        elif missing:
+            print(f"✗ Локаторы не найдены на странице: {missing}")
+        
         # Элементы для проверки
         elements_to_check = [
-            ("full-name", "Поле имени"),
-            ("phone", "Поле телефона"),
-            ("address", "Поле адреса"),
-            ("checkout-btn", "Кнопка оформления"),
-            ("agreement-checkbox", "Чекбокс согласия")
+            (locators.FULL_NAME_INPUT, "Поле имени"),
+            (locators.PHONE_INPUT, "Поле телефона"),
+            (locators.ADDRESS_INPUT, "Поле адреса"),
+            (locators.CHECKOUT_BUTTON, "Кнопка оформления"),
+            (locators.AGREEMENT_CHECKBOX, "Чекбокс согласия")
         ]
         
-        all_elements_found = True
+        all_elements_found = missing == []
         
-        for element_id, description in elements_to_check:
+        for locator, description in elements_to_check:
             try:
-                element = driver.find_element(By.ID, element_id)
+                element = driver.find_element(*locator)
                 if element.is_displayed():
                     print(f"✓ {description} найден и отображается")
                 else:
@@ -360,13 +489,13 @@ def simple_smoke_test():
         
         # Проверяем наличие товаров в корзине
         try:
-            cart_items = driver.find_elements(By.CLASS_NAME, "cart-item")
+            cart_items = driver.find_elements(*locators.CART_ITEM)
             
             if cart_items:
                 print(f"✓ В корзине товаров: {len(cart_items)}")
             else:
                 # Проверяем, есть ли сообщение о пустой корзине
-                empty_cart = driver.find_elements(By.CLASS_NAME, "empty-cart")
+                empty_cart = driver.find_elements(*locators.EMPTY_CART)
                 if empty_cart:
                     print("✓ Корзина пуста (ожидаемое состояние)")
                 else:
@@ -407,11 +536,11 @@ if __name__ == "__main__":
     if smoke_result:
         # Если smoke test прошел, запускаем основные тесты
         print("\n[2/3] Запуск теста оформления заказа...")
-        order_result = test_successful_order_submission()
+        order_result = run_scenario(test_successful_order_submission)
         results.append(("Оформление заказа", order_result))
         
         print("\n[3/3] Запуск теста валидации формы...")
-        validation_result = test_form_validation()
+        validation_result = run_scenario(test_form_validation)
         results.append(("Валидация формы", validation_result))
     else:
         print("\n✗ Smoke test не пройден, пропускаем остальные тесты")